@@ -3,9 +3,93 @@ import os
 import tempfile
 import pandas as pd
 import fitz
-from src import pdf_processor, extractor, ballooner, excel_writer
-import io
+from src import pipeline, bufferpool
 import zipfile
+import concurrent.futures
+import hashlib
+import pickle
+import shutil
+import weakref
+from pathlib import Path
+
+
+class ArtifactDir:
+    """
+    Per-session temp directory for generated artifacts. The finalizer
+    removes it from disk once the session state holding it is garbage
+    collected, so stale sessions don't accumulate output files.
+    """
+
+    def __init__(self):
+        self.path = tempfile.mkdtemp(prefix="qc_report_")
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.path, True)
+
+# On-disk result cache so identical PDFs survive app restarts
+CACHE_DIR = Path("~/.cache/qc_report").expanduser()
+
+
+def cache_lookup(file_hash):
+    """Returns a cached pipeline result for this content hash, or None."""
+    entry = st.session_state.result_cache.get(file_hash)
+    if entry is not None:
+        return entry
+    cache_file = CACHE_DIR / f"{file_hash}.pkl"
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'rb') as f:
+                entry = pickle.load(f)
+            st.session_state.result_cache[file_hash] = entry
+            return entry
+        except Exception:
+            pass  # Corrupt cache entry, just reprocess
+    return None
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_page_png(pdf_bytes, page_num, dpi=150):
+    """
+    Rasterizes one PDF page to PNG bytes. Cached on content so reruns
+    (page navigation, selectbox changes) reuse the rendered image instead
+    of re-opening and re-rasterizing the document every interaction.
+    Returns None if the page doesn't exist.
+    """
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    if page_num >= len(doc):
+        return None
+    pix = doc[page_num].get_pixmap(dpi=dpi)
+    return pix.tobytes("png")
+
+
+def store_result(file_name, result):
+    """
+    Writes pipeline output bytes to disk once and records their paths in
+    session state. Keeping only paths (not the artifact bytes) in
+    processed_files avoids holding two copies of every report in RAM.
+    """
+    base_name = file_name.replace('.pdf', '')
+    art_dir = Path(st.session_state.artifact_dir.path)
+    excel_path = art_dir / f"{base_name}_QC_Report.xlsx"
+    pdf_path = art_dir / f"{base_name}_Ballooned.pdf"
+    excel_path.write_bytes(result['excel_bytes'])
+    pdf_path.write_bytes(result['pdf_bytes'])
+    st.session_state.processed_files[file_name] = {
+        'features': result['features'],
+        'excel_path': str(excel_path),
+        'pdf_path': str(pdf_path),
+        'page_count': result['page_count'],
+        'base_name': base_name
+    }
+
+
+def cache_store(file_hash, entry):
+    """Stores a pipeline result in session state and on disk."""
+    st.session_state.result_cache[file_hash] = entry
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_DIR / f"{file_hash}.pkl", 'wb') as f:
+            pickle.dump(entry, f)
+    except Exception:
+        pass  # Cache write failure is non-fatal
 
 # Page config
 st.set_page_config(
@@ -33,6 +117,10 @@ if 'processed_files' not in st.session_state:
     st.session_state.processed_files = {}
 if 'current_page' not in st.session_state:
     st.session_state.current_page = 0
+if 'result_cache' not in st.session_state:
+    st.session_state.result_cache = {}
+if 'artifact_dir' not in st.session_state:
+    st.session_state.artifact_dir = ArtifactDir()
 
 # File upload
 uploaded_files = st.file_uploader(
@@ -49,52 +137,58 @@ if uploaded_files:
         progress_bar = st.progress(0)
         status = st.empty()
         
-        for idx, file in enumerate(uploaded_files):
-            status.text(f"Processing {file.name}...")
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                tmp_file.write(file.getvalue())
-                tmp_path = tmp_file.name
-            
-            try:
-                doc = pdf_processor.load_pdf(tmp_path)
-                
-                if doc:
-                    all_features = []
-                    for page_num, page in enumerate(doc):
-                        img = pdf_processor.get_page_image(page)
-                        features = extractor.extract_features(page, img, page_num)
-                        all_features.extend(features)
-                    
-                    # Generate outputs in memory with proper naming
-                    base_name = file.name.replace('.pdf', '')
-                    
-                    excel_buffer = io.BytesIO()
-                    excel_writer.generate_excel_report(all_features, excel_buffer)
-                    excel_buffer.seek(0)
-                    
-                    pdf_buffer = io.BytesIO()
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_out:
-                        tmp_out_path = tmp_out.name
-                    ballooner.add_balloons(tmp_path, all_features, tmp_out_path)
-                    with open(tmp_out_path, 'rb') as f:
-                        pdf_buffer.write(f.read())
-                    pdf_buffer.seek(0)
-                    os.unlink(tmp_out_path)
-                    
-                    st.session_state.processed_files[file.name] = {
-                        'features': all_features,
-                        'excel': excel_buffer,
-                        'pdf': pdf_buffer,
-                        'page_count': len(doc),
-                        'base_name': base_name
-                    }
-                
-            except Exception as e:
-                st.error(f"Error processing {file.name}: {str(e)}")
-            
-            progress_bar.progress((idx + 1) / len(uploaded_files))
-        
+        # Check the content-hash cache first: re-uploading identical bytes
+        # skips the whole load -> extract -> balloon -> excel pipeline.
+        done_count = 0
+        to_process = []
+        for file in uploaded_files:
+            file_hash = hashlib.blake2b(file.getvalue(), digest_size=16).hexdigest()
+            cached = cache_lookup(file_hash)
+            if cached is not None:
+                store_result(file.name, cached)
+                done_count += 1
+                progress_bar.progress(done_count / len(uploaded_files))
+            else:
+                to_process.append((file, file_hash))
+
+        if to_process:
+            # Write uploads to temp files first. Worker processes receive
+            # plain paths, not fitz documents (those don't pickle across
+            # processes).
+            tmp_paths = {}
+            for file, _ in to_process:
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+                    tmp_file.write(file.getvalue())
+                    tmp_paths[file.name] = tmp_file.name
+
+            # Each file is independent and CPU-bound, so dispatch to a
+            # process pool and consume results as they finish.
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, len(to_process))
+            ) as executor:
+                futures = {
+                    executor.submit(pipeline.process_one, tmp_paths[file.name], file.name): (file.name, file_hash)
+                    for file, file_hash in to_process
+                }
+
+                for future in concurrent.futures.as_completed(futures):
+                    file_name, file_hash = futures[future]
+                    try:
+                        result = future.result()
+                        if result:
+                            cache_store(file_hash, result)
+                            store_result(file_name, result)
+                    except Exception as e:
+                        st.error(f"Error processing {file_name}: {str(e)}")
+
+                    done_count += 1
+                    status.text(f"Processed {done_count} of {len(uploaded_files)} file(s)")
+                    progress_bar.progress(done_count / len(uploaded_files))
+
+            # Clean up temp input files
+            for path in tmp_paths.values():
+                os.unlink(path)
+
         status.text("✓ Processing complete")
     
     # Show results if any files are processed
@@ -105,23 +199,25 @@ if uploaded_files:
         # Download all button
         if len(st.session_state.processed_files) > 1:
             # Create zip file with all results
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for file_name, results in st.session_state.processed_files.items():
-                    base_name = results['base_name']
-                    
-                    # Add Excel
-                    results['excel'].seek(0)
-                    zip_file.writestr(f"{base_name}_QC_Report.xlsx", results['excel'].read())
-                    
-                    # Add PDF
-                    results['pdf'].seek(0)
-                    zip_file.writestr(f"{base_name}_Ballooned.pdf", results['pdf'].read())
-            
-            zip_buffer.seek(0)
+            # Pooled buffer: reruns reuse the same allocation instead of
+            # growing a fresh BytesIO each interaction
+            zip_buffer = bufferpool.acquire()
+            try:
+                with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                    for file_name, results in st.session_state.processed_files.items():
+                        base_name = results['base_name']
+
+                        # Stream artifacts from disk straight into the archive
+                        # instead of buffering each one in memory first
+                        zip_file.write(results['excel_path'], arcname=f"{base_name}_QC_Report.xlsx")
+                        zip_file.write(results['pdf_path'], arcname=f"{base_name}_Ballooned.pdf")
+                zip_bytes = zip_buffer.getvalue()
+            finally:
+                bufferpool.release(zip_buffer)
+
             st.download_button(
                 label="📦 Download All Files (ZIP)",
-                data=zip_buffer,
+                data=zip_bytes,
                 file_name="QC_Reports.zip",
                 mime="application/zip",
                 use_container_width=True
@@ -139,7 +235,7 @@ if uploaded_files:
         with col1:
             st.download_button(
                 label="📊 Download Excel Report",
-                data=results['excel'],
+                data=Path(results['excel_path']).read_bytes(),
                 file_name=f"{base_name}_QC_Report.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
@@ -147,7 +243,7 @@ if uploaded_files:
         with col2:
             st.download_button(
                 label="📄 Download Ballooned PDF",
-                data=results['pdf'],
+                data=Path(results['pdf_path']).read_bytes(),
                 file_name=f"{base_name}_Ballooned.pdf",
                 mime="application/pdf",
                 use_container_width=True
@@ -173,12 +269,11 @@ if uploaded_files:
         
         # Display page
         try:
-            results['pdf'].seek(0)
-            doc_preview = fitz.open(stream=results['pdf'].read(), filetype="pdf")
-            if st.session_state.current_page < len(doc_preview):
-                page = doc_preview[st.session_state.current_page]
-                pix = page.get_pixmap(dpi=150)
-                img_bytes = pix.tobytes("png")
+            img_bytes = render_page_png(
+                Path(results['pdf_path']).read_bytes(),
+                st.session_state.current_page
+            )
+            if img_bytes is not None:
                 st.image(img_bytes, use_container_width=True)
         except Exception as e:
             st.error(f"Could not load preview: {e}")
@@ -1,6 +1,6 @@
 import argparse
 import os
-from src import pdf_processor, extractor, ballooner, excel_writer
+from src import pdf_processor, pipeline, ballooner, excel_writer
 
 import shutil
 from datetime import datetime
@@ -38,14 +38,9 @@ def main():
     if not doc:
         return
 
-    all_features = []
-    
-    # 2. Process each page
-    for page_num, page in enumerate(doc):
-        print(f"Processing page {page_num + 1}...")
-        img = pdf_processor.get_page_image(page)
-        features = extractor.extract_features(page, img, page_num)
-        all_features.extend(features)
+    # 2. Process pages (in parallel for multi-page documents)
+    print(f"Processing {len(doc)} page(s)...")
+    all_features = pipeline.extract_all_pages(args.input_pdf, len(doc))
 
     # 3. Generate Excel Report
     excel_path = os.path.join(final_output_dir, "qc_report.xlsx")
@@ -0,0 +1,36 @@
+import io
+import threading
+from collections import deque
+
+# Upper bound on pooled buffers; releases beyond this are dropped and the
+# buffer is left to the GC like any other BytesIO.
+MAX_POOL_SIZE = 8
+
+_pool = deque()
+_lock = threading.Lock()
+_pooled_ids = set()  # Guards against double-release of the same buffer
+
+
+def acquire():
+    """Returns an empty BytesIO, reusing a pooled buffer when available."""
+    with _lock:
+        if _pool:
+            buf = _pool.popleft()
+            _pooled_ids.discard(id(buf))
+            return buf
+    return io.BytesIO()
+
+
+def release(buf):
+    """
+    Returns a buffer to the pool for reuse, clearing its contents.
+    Double-releasing the same buffer is a no-op; callers must not touch a
+    buffer after releasing it.
+    """
+    with _lock:
+        if id(buf) in _pooled_ids or len(_pool) >= MAX_POOL_SIZE:
+            return
+        buf.seek(0)
+        buf.truncate(0)
+        _pool.append(buf)
+        _pooled_ids.add(id(buf))
@@ -1,3 +1,4 @@
+import bisect
 import re
 
 # GD&T Symbol Map (Unicode to Name)
@@ -22,6 +23,12 @@ GDT_SYMBOLS = {
     "⌯": "Symmetry", # Symmetry
 }
 
+# Codepoint variants for fast scanning: integer keys hash cheaper than
+# one-char strings, and the frozenset supports C-speed membership and
+# intersection tests when scanning whole lines.
+GDT_CODEPOINTS = frozenset(ord(k) for k in GDT_SYMBOLS)
+GDT_BY_CP = {ord(k): v for k, v in GDT_SYMBOLS.items()}
+
 # Regex Patterns
 
 # Threads: M5x0.8, M24x2, 1/4-20 UNC, etc.
@@ -52,6 +59,12 @@ HOLE_MODIFIERS = [
     "DRILL", "REAM", "TAP", "BORE", "GRIND", "PITCH" # Operations
 ]
 
+# One alternation over all modifiers so a line is scanned once instead of
+# once per modifier; longest-first ordering makes the most specific
+# modifier win where they overlap (e.g. "CBORE" over "BORE")
+HOLE_MODIFIERS_RE = re.compile("|".join(
+    re.escape(m) for m in sorted(HOLE_MODIFIERS, key=len, reverse=True)))
+
 # GD&T Frame Text Pattern (Heuristic)
 # Looks for symbol followed by number, optionally datum
 # e.g. "⏊ 0.01 A", "◎ 0.05 M A B"
@@ -80,6 +93,18 @@ METADATA_PATTERNS = {
     "WEIGHT": re.compile(r'(WEIGHT|MASS)\s*[:.-]?\s*(.*)', re.IGNORECASE)
 }
 
+# Fused metadata scan: every metadata pattern in one alternation, compiled
+# once, so a line with no metadata key (the common case) is rejected with a
+# single search. Only a prefilter: on multi-key lines the alternation picks
+# the leftmost key, not the highest-priority one, so callers must re-run
+# METADATA_PATTERNS in dict order on hit lines to pick the winner.
+METADATA_COMBINED = re.compile(
+    "|".join(
+        "(?:%s)" % p.pattern.replace("(.*)", "(?P<%s>.*)" % key, 1)
+        for key, p in METADATA_PATTERNS.items()
+    ),
+    re.IGNORECASE)
+
 # Table Headers (for heuristic detection)
 TABLE_HEADERS = [
     "ITEM", "QTY", "DESCRIPTION", "PART NO", "MATERIAL", 
@@ -89,6 +114,29 @@ TABLE_HEADERS = [
     "TAG", "X LOC", "Y LOC", "HOLE TABLE", "SIZE"
 ]
 
+# One case-insensitive alternation over all headers: a single search
+# replaces the per-header substring scan of a line
+TABLE_HEADER_RE = re.compile("|".join(map(re.escape, TABLE_HEADERS)), re.IGNORECASE)
+
+# Optional Aho-Corasick automaton for the same check: O(line length) no
+# matter how many headers the list grows to. Falls back to the regex
+# alternation when pyahocorasick isn't installed.
+try:
+    import ahocorasick
+    TABLE_HEADER_AC = ahocorasick.Automaton()
+    for _h in TABLE_HEADERS:
+        TABLE_HEADER_AC.add_word(_h.upper(), _h)
+    TABLE_HEADER_AC.make_automaton()
+except ImportError:
+    TABLE_HEADER_AC = None
+
+
+def has_table_header(text):
+    """Returns True if the line contains any known table-header string."""
+    if TABLE_HEADER_AC is not None:
+        return next(TABLE_HEADER_AC.iter(text.upper()), None) is not None
+    return TABLE_HEADER_RE.search(text) is not None
+
 # Modifier Pattern (for vertical merging)
 # Matches: "3x", "3X", "4 PLACES", "@'a'", "TYP"
 MODIFIER_PATTERN = re.compile(r'^(\d+\s*[xX]|@|TYP|PLACES|PLCS)', re.IGNORECASE)
@@ -97,3 +145,175 @@ MODIFIER_PATTERN = re.compile(r'^(\d+\s*[xX]|@|TYP|PLACES|PLCS)', re.IGNORECASE)
 # Matches: Single Letter followed by 1-2 digits (e.g., A1, B12)
 # Note: "M5" matches this, so ensure Thread detection runs FIRST.
 ALPHANUMERIC_LABEL_PATTERN = re.compile(r'^[A-Z][0-9]{1,2}$', re.IGNORECASE)
+
+# Multi-Pattern Scanning
+# Ordered registry of the feature patterns the extractor dispatches on.
+# The index of a pattern in this tuple is the id reported by scan_line().
+SCAN_THREAD, SCAN_SURFACE_FINISH, SCAN_HARDNESS, SCAN_WELDING, \
+    SCAN_CHAMFER, SCAN_DIMENSION, SCAN_MODIFIER = range(7)
+
+SCAN_PATTERNS = (
+    ("THREAD", THREAD_PATTERN),
+    ("SURFACE_FINISH", SURFACE_FINISH_PATTERN),
+    ("HARDNESS", HARDNESS_PATTERN),
+    ("WELDING", WELDING_PATTERN),
+    ("CHAMFER", CHAMFER_PATTERN),
+    ("DIMENSION", DIMENSION_PATTERN),
+    ("MODIFIER", MODIFIER_PATTERN),
+)
+
+# Combined single-pass pattern: one alternation with a named group per
+# feature pattern, so the interpreter walks a line once instead of once per
+# pattern. Note that finditer never reports a match starting inside an
+# earlier match's span, so the per-group hits under-report: a DIMENSION
+# match can consume the digits where, say, a THREAD match begins. What the
+# alternation does report exactly is whether a line matches any registered
+# pattern at all, so callers treat hits as a none-vs-some prefilter and
+# re-run the individual patterns on hit lines.
+# Case-insensitive patterns keep their flag via an inline (?i:...) group.
+_COMBINED_ORDER = ("THREAD", "CHAMFER", "SURFACE_FINISH", "HARDNESS",
+                   "WELDING", "DIMENSION", "MODIFIER")
+
+def _as_group(name, pattern):
+    if pattern.flags & re.IGNORECASE:
+        return f"(?P<{name.lower()}>(?i:{pattern.pattern}))"
+    return f"(?P<{name.lower()}>{pattern.pattern})"
+
+_PATTERNS_BY_NAME = dict(SCAN_PATTERNS)
+COMBINED_PATTERN = re.compile("|".join(
+    _as_group(name, _PATTERNS_BY_NAME[name]) for name in _COMBINED_ORDER))
+
+# Maps a combined-pattern group name back to its SCAN_PATTERNS id
+_SCAN_ID_BY_GROUP = {name.lower(): i for i, (name, _) in enumerate(SCAN_PATTERNS)}
+
+# Optional RE2 engine for the combined scan: DFA-based, so matching is
+# linear in the line length with no backtracking on pathological input.
+# RE2 has no \uXXXX escape, so that is normalized to the literal
+# codepoint; if RE2 still rejects the pattern we stay on re.
+try:
+    import re2 as _re2
+    _RE2_COMBINED = _re2.compile(
+        COMBINED_PATTERN.pattern.replace("\\u2300", "⌀"))
+except Exception:
+    _RE2_COMBINED = None
+
+
+# Blob variant of the combined pattern for whole-page scans: lines are
+# joined with NUL, which no pattern in the registry can match or cross
+# (it is not \s, \w or a member of any character class), and the line
+# anchors are rewritten so ^/$ also match at the sentinel boundaries.
+# The lookbehind/lookahead rule out RE2, so this stays on stdlib re.
+BLOB_SEPARATOR = "\x00"
+
+
+def _rewrite_anchors(pattern):
+    """
+    Rewrites the ^/$ anchors of a pattern to also match at the NUL
+    sentinels of a joined blob. Walks the pattern tracking escapes and
+    character-class state so a ^ inside [...] (negation) or an escaped
+    \\$ is left alone.
+    """
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            if ch == "]":
+                in_class = False
+            out.append(ch)
+        elif ch == "[":
+            in_class = True
+            out.append(ch)
+        elif ch == "^":
+            out.append(r"(?:\A|(?<=\x00))")
+        elif ch == "$":
+            out.append(r"(?:\Z|(?=\x00))")
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+_BLOB_PATTERN = re.compile(_rewrite_anchors(COMBINED_PATTERN.pattern))
+
+
+def scan_page(lines):
+    """
+    Scans a whole page of lines with one finditer pass over their
+    concatenation, amortizing the per-call regex engine overhead across
+    the page. Match offsets map back to line indices through a bisect on
+    precomputed line starts. Returns one set of pattern ids (indexes
+    into SCAN_PATTERNS) per line. The ids are advisory (the alternation
+    under-reports overlapping patterns); per-line emptiness is exact, so
+    an empty set means no registered pattern matches that line.
+    """
+    hits = [set() for _ in lines]
+    if not lines:
+        return hits
+
+    starts = []
+    pos = 0
+    for text in lines:
+        starts.append(pos)
+        pos += len(text) + 1
+
+    blob = BLOB_SEPARATOR.join(lines)
+    for m in _BLOB_PATTERN.finditer(blob):
+        hits[bisect.bisect_right(starts, m.start()) - 1].add(
+            _SCAN_ID_BY_GROUP[m.lastgroup])
+    return hits
+
+
+def scan(text):
+    """
+    Runs the combined pattern over a line in a single pass.
+    Returns a list of (group_name, start, end, matched_text) tuples; use
+    the individual pattern for that group to extract submatches.
+    """
+    pattern = _RE2_COMBINED if _RE2_COMBINED is not None else COMBINED_PATTERN
+    return [(m.lastgroup, m.start(), m.end(), m.group())
+            for m in pattern.finditer(text)]
+
+# Optional Hyperscan backend: compiles every pattern into one JIT'd DFA so a
+# line is scanned for all of them simultaneously instead of once per pattern.
+# CASELESS can only over-report, which is fine: callers re-run the matching
+# re pattern on hits for group extraction anyway.
+try:
+    import hyperscan
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(
+        expressions=[p.pattern.encode() for _, p in SCAN_PATTERNS],
+        ids=list(range(len(SCAN_PATTERNS))),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+               | hyperscan.HS_FLAG_UTF8] * len(SCAN_PATTERNS),
+    )
+except Exception:
+    _HS_DB = None
+
+
+def scan_line(text):
+    """
+    Scans one line against every feature pattern at once.
+    Returns a list of (pattern_id, start, end) tuples, where pattern_id
+    indexes SCAN_PATTERNS. With Hyperscan, offsets are byte offsets into the
+    UTF-8 encoding, so treat them as advisory and use the corresponding re
+    pattern for group extraction. Without Hyperscan, falls back to a
+    single pass with the combined alternation pattern.
+    """
+    matches = []
+    if _HS_DB is not None:
+        def _on_match(pat_id, start, end, flags, context=None):
+            matches.append((pat_id, start, end))
+
+        _HS_DB.scan(text.encode("utf-8"), match_event_handler=_on_match)
+        return matches
+
+    pattern = _RE2_COMBINED if _RE2_COMBINED is not None else COMBINED_PATTERN
+    for m in pattern.finditer(text):
+        matches.append((_SCAN_ID_BY_GROUP[m.lastgroup], m.start(), m.end()))
+    return matches
@@ -1,238 +1,495 @@
-import pandas as pd
+import numpy as np
+import xlsxwriter
+import logging
 import os
 import io
+import queue
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from xlsxwriter.utility import xl_col_to_name, xl_range
+
+from . import xlsx_cbackend
+
+_log = logging.getLogger(__name__)
+
+# Numba JIT-compiles the classification loop to native code. Optional: the
+# pure-Python dict path below handles everything when it isn't installed.
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# Report row record. A namedtuple is a plain tuple underneath: one
+# allocation per row instead of a dict, and field reads in the write loop
+# skip string hashing.
+_Row = namedtuple("_Row", ("id", "type", "description", "nominal", "min_val", "max_val"))
+
+# Row positions, so the write loop indexes the tuple directly instead of
+# going through per-cell attribute descriptors
+_ID_IDX, _TYPE_IDX, _DESC_IDX, _NOM_IDX, _MIN_IDX, _MAX_IDX = range(len(_Row._fields))
+
+# Column name -> row position for the plain value columns
+_COL_INDEX = {
+    "Balloon #": _ID_IDX,
+    "Type": _TYPE_IDX,
+    "Nominal": _NOM_IDX,
+    "Specification": _NOM_IDX,
+    "Min": _MIN_IDX,
+    "Max": _MAX_IDX,
+}
+
+# Report categories with small-int ids so the classification can run over
+# flat arrays; _CAT_NAMES maps an id back to its table name and doubles as
+# the table order in the report.
+_CAT_CRITICAL, _CAT_LINEAR, _CAT_HOLES, _CAT_THREADS, _CAT_GDT, _CAT_OTHER = range(6)
+_CAT_NAMES = ("Critical Dimensions", "Linear Dimensions", "Holes / Diameters",
+              "Threads", "GD&T", "Other")
+
+# Sub-type -> category id dispatch for features that aren't critical
+# dimensions or GD&T: one dict lookup instead of a branch chain per feature.
+_SUB_TO_CAT = {
+    "Linear": _CAT_LINEAR,
+    "Diameter": _CAT_HOLES,
+    "Radius": _CAT_HOLES,
+    "Thread": _CAT_THREADS,
+}
+
+# Table-specific column structures, frozen at module scope so they aren't
+# rebuilt (six dicts plus lists) on every report.
+_TABLE_CONFIGS = {
+    "Critical Dimensions": {
+        "columns": ("Balloon #", "Nominal", "Min", "Max", "Actual", "Pass/Fail"),
+        "widths": (10, 20, 12, 12, 15, 12),
+        "has_formula": True
+    },
+    "Linear Dimensions": {
+        "columns": ("Balloon #", "Nominal", "Min", "Max", "Actual", "Pass/Fail"),
+        "widths": (10, 20, 12, 12, 15, 12),
+        "has_formula": True
+    },
+    "Holes / Diameters": {
+        "columns": ("Balloon #", "Type", "Nominal", "Min", "Max", "Actual", "Pass/Fail"),
+        "widths": (10, 15, 20, 12, 12, 15, 12),
+        "has_formula": True
+    },
+    "Threads": {
+        "columns": ("Balloon #", "Specification", "Actual", "Pass/Fail"),
+        "widths": (10, 30, 15, 12),
+        "has_formula": False  # Manual pass/fail for threads
+    },
+    "GD&T": {
+        "columns": ("Balloon #", "Type", "Tolerance", "Actual", "Pass/Fail"),
+        "widths": (10, 20, 20, 15, 12),
+        "has_formula": False  # Manual pass/fail for GD&T
+    },
+    "Other": {
+        "columns": ("Balloon #", "Type", "Specification", "Notes"),
+        "widths": (10, 20, 30, 40),
+        "has_formula": False
+    }
+}
+
+# Per-category write plan, also computed once at import: Pass/Fail column
+# indices and the row-parameterised formula template, so per-report work
+# doesn't re-run columns.index() or rebuild template strings.
+_PreparedTable = namedtuple(
+    "_PreparedTable",
+    ("columns", "widths", "has_formula", "pf_col_idx",
+     "min_idx", "max_idx", "actual_idx", "formula_template"))
+
+
+def _prepare(config):
+    columns = config["columns"]
+    has_formula = config["has_formula"] and "Pass/Fail" in columns
+    if has_formula:
+        min_idx = columns.index("Min")
+        max_idx = columns.index("Max")
+        actual_idx = columns.index("Actual")
+        formula_template = (
+            '=IF(ISBLANK({a}{{r}}), "", '
+            'IF(AND({a}{{r}}>={mn}{{r}}, {a}{{r}}<={mx}{{r}}), '
+            '"PASS", "FAIL"))').format(
+                a=xl_col_to_name(actual_idx),
+                mn=xl_col_to_name(min_idx),
+                mx=xl_col_to_name(max_idx))
+        return _PreparedTable(columns, config["widths"], True,
+                              columns.index("Pass/Fail"),
+                              min_idx, max_idx, actual_idx, formula_template)
+    return _PreparedTable(columns, config["widths"], False,
+                          None, None, None, None, None)
+
+
+_PREPARED = {name: _prepare(config) for name, config in _TABLE_CONFIGS.items()}
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _classify(min_arr, max_arr, base_cats, out):
+        # Upgrades Linear features with a < 0.05mm tolerance range to
+        # Critical. Missing bounds arrive as NaN, whose comparisons are
+        # False, so those rows keep their base category. cache=True
+        # amortises the compile across batch runs.
+        for i in range(base_cats.shape[0]):
+            cat = base_cats[i]
+            if cat == _CAT_LINEAR:
+                tol = max_arr[i] - min_arr[i]
+                if 0.0 < tol < 0.0500001:
+                    cat = _CAT_CRITICAL
+            out[i] = cat
 
 def generate_excel_report(features, output_path):
     """
     Generates a professional Excel inspection report from extracted features.
     Groups features by type with smart column structures per table.
     Includes Critical Dimension detection and Pass/Fail formulas.
-    
+
     Args:
         features: List of Feature objects
         output_path: Can be a file path (str) or BytesIO buffer
     """
-    
+
     # 1. Categorize Features with smarter logic
-    categories = {
-        "Critical Dimensions": [],
-        "Linear Dimensions": [],
-        "Holes / Diameters": [],
-        "Threads": [],
-        "GD&T": [],
-        "Other": []  # Surface finish, chamfer, notes, etc.
-    }
-    
     metadata = {}
-    
+
+    ballooned = []
     for f in features:
         if f.type == "Metadata":
             metadata[f.sub_type] = f.value
-            continue
-            
-        if f.id is None:
-            continue
-            
-        # Determine Category
-        cat = "Other"
-        
-        # Check for Critical Dimension (< 0.05mm tolerance range)
-        is_critical = False
-        if f.min_val is not None and f.max_val is not None:
-            try:
-                tol_range = float(f.max_val) - float(f.min_val)
-                if tol_range < 0.0500001 and tol_range > 0:
-                    is_critical = True
-            except:
-                pass
-        
-        # Categorize based on type and criticality
-        if is_critical and f.sub_type == "Linear":
-            cat = "Critical Dimensions"
-        elif f.sub_type == "Linear":
-            cat = "Linear Dimensions"
-        elif f.sub_type in ["Diameter", "Radius"]:
-            cat = "Holes / Diameters"
-        elif f.sub_type == "Thread":
-            cat = "Threads"
-        elif f.type == "GD&T":
-            cat = "GD&T"
-        # Everything else (Surface Finish, Chamfer, Notes, etc.) goes to "Other"
-            
-        # Prepare Row Data
-        row = {
-            "Balloon #": f.id,
-            "Type": f.sub_type,
-            "Description": f.description if f.description else "",
-            "Nominal": f.value,
-            "Min": f.min_val,
-            "Max": f.max_val,
-        }
-        categories[cat].append(row)
+        elif f.id is not None:
+            ballooned.append(f)
+
+    # Base category: one dict lookup per feature; dict misses fall back to
+    # GD&T/Other. Everything else (Surface Finish, Chamfer, Notes, etc.)
+    # goes to "Other".
+    base_cats = [
+        _SUB_TO_CAT.get(f.sub_type, _CAT_GDT if f.type == "GD&T" else _CAT_OTHER)
+        for f in ballooned]
+
+    if HAVE_NUMBA and ballooned:
+        # SoA layout: the critical-dimension upgrade runs as a native loop
+        # over parallel min/max/category arrays instead of per-object
+        # attribute access in the interpreter.
+        n = len(ballooned)
+        min_arr = np.empty(n)
+        max_arr = np.empty(n)
+        for i, f in enumerate(ballooned):
+            min_arr[i] = f.min_val if isinstance(f.min_val, (int, float)) else np.nan
+            max_arr[i] = f.max_val if isinstance(f.max_val, (int, float)) else np.nan
+        cat_ids = np.empty(n, dtype=np.int8)
+        _classify(min_arr, max_arr, np.array(base_cats, dtype=np.int8), cat_ids)
+    else:
+        # Upgrade Linear features with a < 0.05mm tolerance range to
+        # Critical. The isinstance check replaces a try/except float()
+        # pair - parsed tolerance bounds are already numeric when present.
+        cat_ids = base_cats
+        for i, f in enumerate(ballooned):
+            if (cat_ids[i] == _CAT_LINEAR
+                    and isinstance(f.min_val, (int, float))
+                    and isinstance(f.max_val, (int, float))
+                    and 0 < f.max_val - f.min_val < 0.0500001):
+                cat_ids[i] = _CAT_CRITICAL
+
+    by_cat = {name: [] for name in _CAT_NAMES}
+    for f, cat_id in zip(ballooned, cat_ids):
+        by_cat[_CAT_NAMES[cat_id]].append(f)
+
+    # Opt-in C backend: QC_REPORT_XLSX_BACKEND=c routes file-path reports
+    # through libxlsxwriter when the shared library is available, removing
+    # Python per-cell overhead from the write path. BytesIO sinks and
+    # missing-library setups fall through to the default backend below.
+    if (xlsx_cbackend.HAVE_LIBXLSXWRITER
+            and os.environ.get("QC_REPORT_XLSX_BACKEND") == "c"
+            and isinstance(output_path, str)):
+        tables = []
+        for cat_name in _CAT_NAMES:
+            feats = by_cat[cat_name]
+            if feats:
+                tables.append((cat_name, [
+                    _Row(f.id, f.sub_type,
+                         f.description if f.description else "",
+                         f.value, f.min_val, f.max_val)
+                    for f in feats]))
+        xlsx_cbackend.write_report(metadata, tables, output_path, _TABLE_CONFIGS)
+        _log.info("Report generated: %s", output_path)
+        return
 
     # 2. Create Excel Writer
-    with pd.ExcelWriter(output_path, engine='xlsxwriter') as writer:
-        workbook = writer.book
-        worksheet = workbook.add_worksheet("Inspection Report")
-        writer.sheets["Inspection Report"] = worksheet
-        
-        # 3. Define Styles
-        title_format = workbook.add_format({
-            'bold': True, 'font_size': 14, 'bg_color': '#D9E1F2', 'border': 1
-        })
-        header_format = workbook.add_format({
-            'bold': True, 'font_size': 11, 'bg_color': '#4472C4', 'font_color': 'white', 'border': 1, 'align': 'center'
-        })
-        cell_format = workbook.add_format({
-            'border': 1, 'align': 'center'
-        })
-        text_format = workbook.add_format({
-            'border': 1, 'align': 'left'
-        })
-        pass_format = workbook.add_format({
-            'bg_color': '#C6EFCE', 'font_color': '#006100', 'border': 1, 'align': 'center'
-        })
-        fail_format = workbook.add_format({
-            'bg_color': '#FFC7CE', 'font_color': '#9C0006', 'border': 1, 'align': 'center'
-        })
-        
-        # 4. Write Metadata Section
-        worksheet.write(0, 0, "PART METADATA", title_format)
-        row_idx = 1
-        for key, val in metadata.items():
-            worksheet.write(row_idx, 0, key, header_format)
-            worksheet.write(row_idx, 1, val, text_format)
-            row_idx += 1
-            
-        row_idx += 2 # Spacer
-        
-        # 5. Define Table-Specific Column Structures
-        table_configs = {
-            "Critical Dimensions": {
-                "columns": ["Balloon #", "Nominal", "Min", "Max", "Actual", "Pass/Fail"],
-                "widths": [10, 20, 12, 12, 15, 12],
-                "has_formula": True
-            },
-            "Linear Dimensions": {
-                "columns": ["Balloon #", "Nominal", "Min", "Max", "Actual", "Pass/Fail"],
-                "widths": [10, 20, 12, 12, 15, 12],
-                "has_formula": True
-            },
-            "Holes / Diameters": {
-                "columns": ["Balloon #", "Type", "Nominal", "Min", "Max", "Actual", "Pass/Fail"],
-                "widths": [10, 15, 20, 12, 12, 15, 12],
-                "has_formula": True
-            },
-            "Threads": {
-                "columns": ["Balloon #", "Specification", "Actual", "Pass/Fail"],
-                "widths": [10, 30, 15, 12],
-                "has_formula": False  # Manual pass/fail for threads
-            },
-            "GD&T": {
-                "columns": ["Balloon #", "Type", "Tolerance", "Actual", "Pass/Fail"],
-                "widths": [10, 20, 20, 15, 12],
-                "has_formula": False  # Manual pass/fail for GD&T
-            },
-            "Other": {
-                "columns": ["Balloon #", "Type", "Specification", "Notes"],
-                "widths": [10, 20, 30, 40],
-                "has_formula": False
-            }
-        }
-        
-        # 6. Write Feature Tables
-        cat_order = ["Critical Dimensions", "Linear Dimensions", "Holes / Diameters", "Threads", "GD&T", "Other"]
-        
-        for cat_name in cat_order:
-            rows = categories.get(cat_name, [])
-            if not rows:
-                continue
-            
-            config = table_configs[cat_name]
-            columns = config["columns"]
-            col_widths = config["widths"]
-            
-            # Set column widths
-            for i, width in enumerate(col_widths):
-                worksheet.set_column(i, i, width)
-            
-            # Write Category Title
-            worksheet.merge_range(row_idx, 0, row_idx, len(columns)-1, cat_name.upper(), title_format)
-            row_idx += 1
-            
-            # Write Table Header
-            for col_idx, col_name in enumerate(columns):
-                worksheet.write(row_idx, col_idx, col_name, header_format)
-            row_idx += 1
-            
-            # Write Rows
-            for row_data in rows:
-                xl_row = row_idx + 1
-                col_idx = 0
-                
-                # Write data based on column structure
+    # The two xlsxwriter modes are mutually exclusive, so pick by sink:
+    # - BytesIO (web app): in_memory assembles the workbook entirely in RAM,
+    #   skipping the temp-file spool + fsync xlsxwriter does by default.
+    # - File path (CLI / batch): constant_memory streams each row to the zip
+    #   as the next one starts. The sheet is written strictly top-to-bottom,
+    #   which is exactly the access pattern that mode needs, and peak memory
+    #   stays O(1) in the row count.
+    # Either way, turn off the per-cell regex scans write() runs on every
+    # string to auto-detect numbers, formulas and URLs: the report never
+    # relies on that conversion, and the typed writers pass exact types.
+    options = {
+        'strings_to_numbers': False,
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+    }
+    if isinstance(output_path, io.BytesIO):
+        options['in_memory'] = True
+    else:
+        options['constant_memory'] = True
+    in_memory_mode = 'in_memory' in options
+
+    # Producer/consumer split: a single worker thread owns the workbook and
+    # serializes each table while this thread builds the next category's
+    # rows, so row preparation overlaps xlsxwriter's writing and zlib
+    # compression (which releases the GIL). xlsxwriter is not thread-safe,
+    # so the workbook never leaves the worker; only finished
+    # (cat_name, rows) batches cross the queue.
+    work_queue = queue.Queue()
+
+    def _write_workbook():
+        # Drive xlsxwriter directly: pd.ExcelWriter was only used as a
+        # context manager here (no DataFrame writes), and its bookkeeping -
+        # sheet registration, format-registry indirection, the pandas import
+        # itself - is pure overhead on the write path.
+        workbook = xlsxwriter.Workbook(output_path, options)
+        try:
+            worksheet = workbook.add_worksheet("Inspection Report")
+
+            # 3. Define Styles via a memoizing cache: each distinct property
+            # set registers exactly one format object (one <xf> slot in
+            # styles.xml), so requesting the same style twice - here or in
+            # future additions - can't bloat the styles part with duplicates.
+            _format_cache = {}
+
+            def get_format(**props):
+                key = frozenset(props.items())
+                fmt = _format_cache.get(key)
+                if fmt is None:
+                    fmt = _format_cache[key] = workbook.add_format(props)
+                return fmt
+
+            title_format = get_format(bold=True, font_size=14, bg_color='#D9E1F2', border=1)
+            header_format = get_format(bold=True, font_size=11, bg_color='#4472C4',
+                                       font_color='white', border=1, align='center')
+            cell_format = get_format(border=1, align='center')
+            # Differs from cell_format only in alignment, kept for the
+            # left-aligned text columns; pass/fail carry real colour
+            # differences.
+            text_format = get_format(border=1, align='left')
+            pass_format = get_format(bg_color='#C6EFCE', font_color='#006100',
+                                     border=1, align='center')
+            fail_format = get_format(bg_color='#FFC7CE', font_color='#9C0006',
+                                     border=1, align='center')
+
+            # 4. Write Metadata Section
+            worksheet.write(0, 0, "PART METADATA", title_format)
+            row_idx = 1
+            for key, val in metadata.items():
+                worksheet.write(row_idx, 0, key, header_format)
+                worksheet.write(row_idx, 1, val, text_format)
+                row_idx += 1
+
+            row_idx += 2 # Spacer
+
+            # Column sizing: the config widths act as minimums (widest
+            # request per index across tables), and content lengths observed
+            # while writing widen any column that needs more. The actual
+            # set_column calls happen once at the end - column records are
+            # emitted at close, even in constant_memory mode, so sizing from
+            # the same pass that writes the cells costs nothing extra.
+            col_widths = {}
+            for config in _TABLE_CONFIGS.values():
+                for i, width in enumerate(config["widths"]):
+                    if width > col_widths.get(i, 0):
+                        col_widths[i] = width
+
+            # 6. Write Feature Tables as they arrive from the producer
+            while True:
+                item = work_queue.get()
+                if item is None:
+                    break
+                cat_name, rows = item
+
+                prep = _PREPARED[cat_name]
+                columns = prep.columns
+
+                # Apply Conditional Formatting to Pass/Fail Column.
+                # Registered up front (the data range is known from
+                # len(rows)) because in constant_memory mode rows leave the
+                # buffer as soon as the next row starts, so formatting can't
+                # be added after.
+                pf_array_span = None
+                if prep.has_formula:
+                    pf_col_idx = prep.pf_col_idx
+                    start_row = row_idx + 2  # After title and header rows
+                    end_row = start_row + len(rows) - 1
+
+                    # Shared formula: when writes are order-independent
+                    # (in_memory) and every row has tolerance bounds, the
+                    # whole Pass/Fail column becomes one array formula stored
+                    # once in the sheet XML instead of a ~160-byte string per
+                    # row. constant_memory silently drops backward writes,
+                    # and rows without bounds must stay blank, so those keep
+                    # per-row formulas.
+                    if in_memory_mode and all(
+                            r.min_val is not None and r.max_val is not None for r in rows):
+                        pf_array_span = (start_row, end_row, pf_col_idx)
+                    # One A1 range string shared by both rules: xlsxwriter
+                    # then collapses them into a single conditionalFormatting
+                    # block instead of re-deriving and emitting the range per
+                    # rule. stop_if_true lets Excel skip the FAIL test on
+                    # PASS cells.
+                    pf_range = xl_range(start_row, pf_col_idx, end_row, pf_col_idx)
+
+                    worksheet.conditional_format(pf_range, {
+                        'type': 'cell',
+                        'criteria': 'equal to',
+                        'value': '"PASS"',
+                        'format': pass_format,
+                        'stop_if_true': True
+                    })
+                    worksheet.conditional_format(pf_range, {
+                        'type': 'cell',
+                        'criteria': 'equal to',
+                        'value': '"FAIL"',
+                        'format': fail_format
+                    })
+
+                # Write Category Title
+                worksheet.merge_range(row_idx, 0, row_idx, len(columns)-1, cat_name.upper(), title_format)
+                row_idx += 1
+
+                # Write Table Header
+                for col_idx, col_name in enumerate(columns):
+                    worksheet.write(row_idx, col_idx, col_name, header_format)
+                row_idx += 1
+
+                # Hot-path locals: the typed write_* methods skip the
+                # isinstance dispatch, URL/date regex matching and numeric
+                # coercion that worksheet.write() runs on every cell.
+                write_number = worksheet.write_number
+                write_string = worksheet.write_string
+                write_blank = worksheet.write_blank
+                write_formula = worksheet.write_formula
+
+                def write_value(r, c, val, fmt):
+                    # Number/string/blank by actual type, bypassing write()
+                    if isinstance(val, (int, float)):
+                        write_number(r, c, val, fmt)
+                        val = str(val)
+                    elif val:
+                        write_string(r, c, val, fmt)
+                    else:
+                        write_blank(r, c, None, fmt)
+                        return
+                    # Track content width for the final auto-sizing pass
+                    w = len(val) + 2
+                    if w > col_widths[c]:
+                        col_widths[c] = w
+
+                # The per-row formula template comes prebuilt from the
+                # module-level plan; only the array-formula variant depends
+                # on this table's row range.
+                formula_template = None
+                if prep.has_formula:
+                    if pf_array_span is not None:
+                        # One array formula covers the whole column; the
+                        # per-row writer then leaves those cells alone.
+                        a_start, a_end, a_col = pf_array_span
+                        actual_rng = xl_range(a_start, prep.actual_idx, a_end, prep.actual_idx)
+                        min_rng = xl_range(a_start, prep.min_idx, a_end, prep.min_idx)
+                        max_rng = xl_range(a_start, prep.max_idx, a_end, prep.max_idx)
+                        # The bounds test multiplies the comparison arrays
+                        # instead of AND-ing them: in a CSE formula AND()
+                        # collapses every comparison in the ranges to one
+                        # scalar, which would give all rows a shared
+                        # verdict, while (a>=mn)*(a<=mx) stays element-wise
+                        # like the per-row AND.
+                        worksheet.write_array_formula(
+                            a_start, a_col, a_end, a_col,
+                            '{{=IF(ISBLANK({a}), "", '
+                            'IF(({a}>={mn})*({a}<={mx}), "PASS", "FAIL"))}}'.format(
+                                a=actual_rng, mn=min_rng, mx=max_rng),
+                            cell_format)
+                    else:
+                        formula_template = prep.formula_template
+
+                # Resolve each column to its writer once per table; the row
+                # loop then just walks this list instead of re-running the
+                # if/elif chain on column names for every cell.
+                def _field_writer(idx, fmt):
+                    return lambda r, c, row_data, xl_row: write_value(r, c, row_data[idx], fmt)
+
+                def _write_tolerance(r, c, row_data, xl_row):
+                    mn, mx = row_data[_MIN_IDX], row_data[_MAX_IDX]
+                    tol_str = f"{mn} / {mx}" if mn is not None else ""
+                    write_value(r, c, tol_str, cell_format)
+
+                def _write_actual(r, c, row_data, xl_row):
+                    write_blank(r, c, None, cell_format)
+
+                def _write_notes(r, c, row_data, xl_row):
+                    write_blank(r, c, None, text_format)
+
+                def _write_pass_fail(r, c, row_data, xl_row):
+                    if pf_array_span is not None:
+                        return  # Column already covered by the array formula
+                    # Write formula if applicable
+                    if (formula_template and row_data[_MIN_IDX] is not None
+                            and row_data[_MAX_IDX] is not None):
+                        write_formula(r, c, formula_template.format(r=xl_row), cell_format)
+                    else:
+                        write_blank(r, c, None, cell_format)
+
+                col_writers = []
                 for col_name in columns:
-                    if col_name == "Balloon #":
-                        worksheet.write(row_idx, col_idx, row_data["Balloon #"], cell_format)
-                    elif col_name == "Type":
-                        worksheet.write(row_idx, col_idx, row_data["Type"], text_format)
-                    elif col_name == "Nominal":
-                        worksheet.write(row_idx, col_idx, row_data["Nominal"], cell_format)
-                    elif col_name == "Specification":
-                        worksheet.write(row_idx, col_idx, row_data["Nominal"], cell_format)
-                    elif col_name == "Tolerance":
-                        tol_str = f"{row_data['Min']} / {row_data['Max']}" if row_data['Min'] is not None else ""
-                        worksheet.write(row_idx, col_idx, tol_str, cell_format)
-                    elif col_name == "Min":
-                        worksheet.write(row_idx, col_idx, row_data["Min"], cell_format)
-                    elif col_name == "Max":
-                        worksheet.write(row_idx, col_idx, row_data["Max"], cell_format)
+                    if col_name == "Tolerance":
+                        col_writers.append(_write_tolerance)
                     elif col_name == "Actual":
-                        worksheet.write(row_idx, col_idx, "", cell_format)
+                        col_writers.append(_write_actual)
                     elif col_name == "Notes":
-                        worksheet.write(row_idx, col_idx, "", text_format)
+                        col_writers.append(_write_notes)
                     elif col_name == "Pass/Fail":
-                        # Write formula if applicable
-                        if config["has_formula"] and row_data["Min"] is not None and row_data["Max"] is not None:
-                            # Find the column indices for Min, Max, Actual
-                            min_col_idx = columns.index("Min")
-                            max_col_idx = columns.index("Max")
-                            actual_col_idx = columns.index("Actual")
-                            
-                            min_col = chr(65 + min_col_idx)  # Convert to Excel column letter
-                            max_col = chr(65 + max_col_idx)
-                            actual_col = chr(65 + actual_col_idx)
-                            
-                            formula = f'=IF(ISBLANK({actual_col}{xl_row}), "", IF(AND({actual_col}{xl_row}>={min_col}{xl_row}, {actual_col}{xl_row}<={max_col}{xl_row}), "PASS", "FAIL"))'
-                            worksheet.write_formula(row_idx, col_idx, formula, cell_format)
-                        else:
-                            worksheet.write(row_idx, col_idx, "", cell_format)
-                    
-                    col_idx += 1
-                
-                row_idx += 1
-            
-            # Apply Conditional Formatting to Pass/Fail Column
-            if "Pass/Fail" in columns and config["has_formula"]:
-                pf_col_idx = columns.index("Pass/Fail")
-                start_row = row_idx - len(rows)
-                end_row = row_idx - 1
-                
-                worksheet.conditional_format(start_row, pf_col_idx, end_row, pf_col_idx, {
-                    'type': 'cell',
-                    'criteria': 'equal to',
-                    'value': '"PASS"',
-                    'format': pass_format
-                })
-                worksheet.conditional_format(start_row, pf_col_idx, end_row, pf_col_idx, {
-                    'type': 'cell',
-                    'criteria': 'equal to',
-                    'value': '"FAIL"',
-                    'format': fail_format
-                })
-
-            row_idx += 2 # Spacer between tables
-            
-    # Print only if output_path is a string (file path)
+                        col_writers.append(_write_pass_fail)
+                    else:
+                        # Balloon #, Type, Nominal, Specification, Min, Max
+                        fmt = text_format if col_name == "Type" else cell_format
+                        col_writers.append(_field_writer(_COL_INDEX[col_name], fmt))
+
+                # Write Rows
+                for row_data in rows:
+                    xl_row = row_idx + 1
+                    for col_idx, cell_writer in enumerate(col_writers):
+                        cell_writer(row_idx, col_idx, row_data, xl_row)
+                    row_idx += 1
+
+                row_idx += 2 # Spacer between tables
+
+            # Apply the final widths once, now that all content is known
+            for i, width in col_widths.items():
+                worksheet.set_column(i, i, width)
+        finally:
+            workbook.close()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        writer_job = pool.submit(_write_workbook)
+        try:
+            for cat_name in _CAT_NAMES:
+                feats = by_cat[cat_name]
+                if not feats:
+                    continue
+                # Prepare Row Data; the worker serializes the previous
+                # category while this batch is built.
+                rows = [_Row(f.id, f.sub_type,
+                             f.description if f.description else "",
+                             f.value, f.min_val, f.max_val)
+                        for f in feats]
+                work_queue.put((cat_name, rows))
+        finally:
+            work_queue.put(None)  # Sentinel: no more tables
+        writer_job.result()
+
+    # Log only if output_path is a string (file path). Lazy %s formatting:
+    # no string is built, and no blocking stdout write happens, unless a
+    # handler actually emits at INFO.
     if isinstance(output_path, str):
-        print(f"Report generated: {output_path}")
+        _log.info("Report generated: %s", output_path)
@@ -1,17 +1,23 @@
 import pytesseract
 
+from dataclasses import dataclass
+
+@dataclass(slots=True)
 class Feature:
-    def __init__(self, id, type, value, location, page_num, sub_type=None, description=None):
-        self.id = id
-        self.type = type
-        self.value = value
-        self.location = location # (x, y, w, h)
-        self.page_num = page_num
-        self.sub_type = sub_type # e.g., "Thread", "Chamfer", "Perpendicularity"
-        self.description = description # e.g., "M5x0.8", "0.01 wrt A"
-        self.tolerance = None
-        self.min_val = None
-        self.max_val = None
+    # slots=True drops the per-instance __dict__ (hundreds of features per
+    # page add up) and speeds attribute access in the filter loops.
+    # Not frozen: the spatial filters re-type features and the extractor
+    # fills tolerance bounds after construction.
+    id: object
+    type: str
+    value: str
+    location: tuple # (x0, y0, x1, y1)
+    page_num: int
+    sub_type: str = None # e.g., "Thread", "Chamfer", "Perpendicularity"
+    description: str = None # e.g., "M5x0.8", "0.01 wrt A"
+    tolerance: object = None
+    min_val: float = None
+    max_val: float = None
 
 import re
 
@@ -19,109 +25,139 @@ import cv2
 import numpy as np
 from . import engineering_patterns
 
+# Optional Numba backend for the rect-clustering inner loop. Without it the
+# pure-Python spatial hash + union-find below is used.
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# Symbols stripped before tolerance parsing (⌀, Ø, R prefixes)
+_STRIP_RE = re.compile(r'[⌀ØR]')
+
+# Characters of a bare toleranceless number; gates the parse_tolerance
+# fast path to exactly what the regex alternative `^[\d.]+$` accepts
+# (float() alone would also take "-5", "1e3", "inf")
+_NUMERIC_CHARS = frozenset("0123456789.")
+
+# Markers that classify a dimension as a hole/radius: one set intersection
+# against the value's characters instead of several substring scans
+_DIAMETER_CHARS = frozenset("Ø⌀")
+_HOLE_RADIUS_CHARS = frozenset("ØR⌀")
+
+# Master tolerance pattern: one alternation, compiled once, covering every
+# format the old per-call pattern chain handled. Alternatives appear in the
+# old priority order; the nominal group of the winning form tells the parser
+# which branch applies.
+#   pm:   "13 ± 0.1"
+#   updn: "10 +0.2 -0.1" (or "+0.2/-0.1")
+#   upup: "45 +0.015 +0.005"
+#   dndn: "67 -0.1 -0.2"
+#   upz:  "12.1 +0.1 0"
+#   zdn:  "12.1 0 -0.1"
+#   num:  bare number, no tolerance
+_TOL_RE = re.compile(
+    r'(?P<pm_n>[\d.]+)\s*[±]\s*(?P<pm_t>[\d.]+)'
+    r'|(?P<updn_n>[\d.]+)\s*\+\s*(?P<updn_u>[\d.]+)\s*[/-]\s*(?P<updn_l>[\d.]+)'
+    r'|(?P<upup_n>[\d.]+)\s*\+\s*(?P<upup_u>[\d.]+)\s+\+\s*(?P<upup_l>[\d.]+)'
+    r'|(?P<dndn_n>[\d.]+)\s+-\s*(?P<dndn_u>[\d.]+)\s+-\s*(?P<dndn_l>[\d.]+)'
+    r'|(?P<upz_n>[\d.]+)\s*\+\s*(?P<upz_u>[\d.]+)\s+0'
+    r'|(?P<zdn_n>[\d.]+)\s+0\s*-\s*(?P<zdn_l>[\d.]+)'
+    r'|^(?P<num_n>[\d.]+)$'
+)
+
 def parse_tolerance(dim_string):
     """
     Parse a dimension string to extract nominal, min, and max values.
     Handles formats like:
     - "13 ± 0.1" -> nominal=13, min=12.9, max=13.1
     - "12.1 +0.1 0" -> nominal=12.1, min=12.1, max=12.2
-    - "10 +0.2/-0.1" -> nominal=10, min=9.9, max=10.2
+    - "10 +0.2 -0.1" -> nominal=10, min=9.9, max=10.2
     - "67 -0.1 -0.2" -> nominal=67, min=66.8, max=66.9
     - "⌀ 12.1 +0.1 0" -> nominal=12.1, min=12.1, max=12.2
     Returns: (nominal, min_val, max_val) or (None, None, None) if parsing fails
     """
-    import re
-    
     # Remove symbols like ⌀, R, etc. for parsing
-    clean_str = dim_string.replace("⌀", "").replace("Ø", "").replace("R", "").strip()
-    
-    # Pattern 1: ± format (e.g., "13 ± 0.1")
-    match = re.search(r'([\d.]+)\s*[±]\s*([\d.]+)', clean_str)
-    if match:
+    clean_str = _STRIP_RE.sub("", dim_string).strip()
+
+    # Fast path: most dimensions are a plain number with no tolerance, so
+    # skip the regex when the cleaned string is only digits and dots
+    if clean_str and frozenset(clean_str) <= _NUMERIC_CHARS:
         try:
-            nominal = float(match.group(1))
-            tol = float(match.group(2))
+            nominal = float(clean_str)
+        except ValueError:
+            # Malformed number (e.g. "1.2.3"), same verdict as the regex path
+            return None, None, None
+        return nominal, nominal, nominal
+
+    match = _TOL_RE.search(clean_str)
+    if not match:
+        return None, None, None
+
+    group = match.group
+    try:
+        if group("pm_n") is not None:
+            nominal = float(group("pm_n"))
+            tol = float(group("pm_t"))
             return nominal, nominal - tol, nominal + tol
-        except:
-            pass
-    
-    # Pattern 2: +X -Y format (e.g., "10 +0.2/-0.1" or "10 +0.2 -0.1")
-    match = re.search(r'([\d.]+)\s*\+\s*([\d.]+)\s*[/-]\s*([\d.]+)', clean_str)
-    if match:
-        try:
-            nominal = float(match.group(1))
-            upper_tol = float(match.group(2))
-            lower_tol = float(match.group(3))
-            return nominal, nominal - lower_tol, nominal + upper_tol
-        except:
-            pass
-    
-    # Pattern 2b: +X +Y format (e.g., "45 +0.015 +0.005")
-    # This means upper tolerance is +0.015 (max = nominal + 0.015) and lower is +0.005 (min = nominal + 0.005)
-    match = re.search(r'([\d.]+)\s*\+\s*([\d.]+)\s+\+\s*([\d.]+)', clean_str)
-    if match:
-        try:
-            nominal = float(match.group(1))
-            upper_tol = float(match.group(2))  # Larger positive (further from nominal)
-            lower_tol = float(match.group(3))  # Smaller positive (closer to nominal)
-            return nominal, nominal + lower_tol, nominal + upper_tol
-        except:
-            pass
-    
-    # Pattern 3: -X -Y format (e.g., "67 -0.1 -0.2")
-    # This means upper tolerance is -0.1 (max = nominal - 0.1) and lower is -0.2 (min = nominal - 0.2)
-    match = re.search(r'([\d.]+)\s+-\s*([\d.]+)\s+-\s*([\d.]+)', clean_str)
-    if match:
-        try:
-            nominal = float(match.group(1))
-            upper_tol = float(match.group(2))  # Less negative (closer to nominal)
-            lower_tol = float(match.group(3))  # More negative (further from nominal)
-            return nominal, nominal - lower_tol, nominal - upper_tol
-        except:
-            pass
-    
-    # Pattern 4: +X 0 format (e.g., "12.1 +0.1 0")
-    match = re.search(r'([\d.]+)\s*\+\s*([\d.]+)\s+0', clean_str)
-    if match:
-        try:
-            nominal = float(match.group(1))
-            upper_tol = float(match.group(2))
-            return nominal, nominal, nominal + upper_tol
-        except:
-            pass
-    
-    # Pattern 5: 0 -X format (e.g., "12.1 0 -0.1")
-    match = re.search(r'([\d.]+)\s+0\s*-\s*([\d.]+)', clean_str)
-    if match:
-        try:
-            nominal = float(match.group(1))
-            lower_tol = float(match.group(2))
-            return nominal, nominal - lower_tol, nominal
-        except:
-            pass
-    
-    # Pattern 6: Just a number (no tolerance)
-    match = re.search(r'^([\d.]+)$', clean_str.strip())
-    if match:
-        try:
-            nominal = float(match.group(1))
-            return nominal, nominal, nominal
-        except:
-            pass
-    
-    return None, None, None
 
+        if group("updn_n") is not None:
+            # +X -Y: upper tolerance above nominal, lower below
+            nominal = float(group("updn_n"))
+            return (nominal,
+                    nominal - float(group("updn_l")),
+                    nominal + float(group("updn_u")))
+
+        if group("upup_n") is not None:
+            # +X +Y: both tolerances above nominal (X further out than Y)
+            nominal = float(group("upup_n"))
+            return (nominal,
+                    nominal + float(group("upup_l")),
+                    nominal + float(group("upup_u")))
+
+        if group("dndn_n") is not None:
+            # -X -Y: both tolerances below nominal (Y further out than X)
+            nominal = float(group("dndn_n"))
+            return (nominal,
+                    nominal - float(group("dndn_l")),
+                    nominal - float(group("dndn_u")))
 
-def extract_features(pdf_page, image, page_num):
-    """Extracts dimensions, GD&T, and other features from a page."""
+        if group("upz_n") is not None:
+            # +X 0: unilateral above nominal
+            nominal = float(group("upz_n"))
+            return nominal, nominal, nominal + float(group("upz_u"))
+
+        if group("zdn_n") is not None:
+            # 0 -X: unilateral below nominal
+            nominal = float(group("zdn_n"))
+            return nominal, nominal - float(group("zdn_l")), nominal
+
+        # Bare number, no tolerance
+        nominal = float(group("num_n"))
+        return nominal, nominal, nominal
+    except ValueError:
+        # Malformed number inside a matched form (e.g. "1.2.3")
+        return None, None, None
+
+
+def extract_features(pdf_page, image, page_num, cache=None):
+    """
+    Extracts dimensions, GD&T, and other features from a page.
+    Pass a pdf_processor.PageCache as cache to reuse its parsed text dict
+    and drawings instead of traversing the content stream again.
+    """
     features = []
     feature_id = 1 # Should probably be global or passed in to maintain continuity across pages
-    
+
     # 1. Text Extraction with Merging
     # PyMuPDF returns blocks. Sometimes a dimension "10.00 ± 0.05" is split into "10.00" and "± 0.05".
     # We need to merge text that is spatially close.
-    
-    raw_blocks = pdf_page.get_text("dict")["blocks"]
+
+    if cache is not None:
+        raw_blocks = cache.text_dict["blocks"]
+    else:
+        raw_blocks = pdf_page.get_text("dict")["blocks"]
     
     # RE-IMPLEMENTATION:
     # Instead of complex merging, let's just concatenate all text in a LINE.
@@ -139,105 +175,113 @@ def extract_features(pdf_page, image, page_num):
                 if text:
                     all_lines.append({"text": text, "bbox": line["bbox"]})
     
-    # Simple Vertical Merge
-    i = 0
-    while i < len(all_lines):
-        current_line = all_lines[i]
-        text = current_line["text"]
-        bbox = current_line["bbox"]
-        
-        # Look ahead
-        if i + 1 < len(all_lines):
-            next_line = all_lines[i+1]
-            next_text = next_line["text"]
-            
-            # Heuristic: Merge if next line is a Tolerance, Modifier, or Continuation
-            
-            # Check vertical distance
-            v_dist = next_line["bbox"][1] - bbox[3] # y0_next - y1_current
-            
-            should_merge = False
-            
-            if v_dist < 15: # Slightly increased threshold
-                # 1. Tolerance (+/-)
-                if next_text.startswith("+") or next_text.startswith("-"):
-                    should_merge = True
-                
-                # 2. Zero Tolerance ("0")
-                # Often appears as "0" over "-0.1" or "+0.1" over "0"
-                elif next_text.strip() == "0":
-                    should_merge = True
-                    
-                # 3. Modifiers (3x, @'a')
-                elif engineering_patterns.MODIFIER_PATTERN.match(next_text):
-                    should_merge = True
-                    
-            if should_merge:
-                # Merge
-                text += " " + next_text
-                # Expand bbox to include next line
-                bbox = (
-                    min(bbox[0], next_line["bbox"][0]),
-                    min(bbox[1], next_line["bbox"][1]),
-                    max(bbox[2], next_line["bbox"][2]),
-                    max(bbox[3], next_line["bbox"][3])
-                )
-                i += 1 # Skip next line
-                
-                # Check for a THIRD line (e.g. +0.1 over 0)
-                if i + 1 < len(all_lines):
-                    next_next_line = all_lines[i+1]
-                    next_next_text = next_next_line["text"]
-                    v_dist_2 = next_next_line["bbox"][1] - bbox[3]
-                    
-                    should_merge_2 = False
-                    if v_dist_2 < 15:
-                        if next_next_text.startswith("+") or next_next_text.startswith("-") or next_next_text.strip() == "0":
-                            should_merge_2 = True
-                            
-                    if should_merge_2:
-                        text += " " + next_next_text
-                        bbox = (
-                            min(bbox[0], next_next_line["bbox"][0]),
-                            min(bbox[1], next_next_line["bbox"][1]),
-                            max(bbox[2], next_next_line["bbox"][2]),
-                            max(bbox[3], next_next_line["bbox"][3])
-                        )
-                        i += 1
-        
-        processed_lines.append({"text": text, "bbox": bbox})
-        i += 1
+    # Simple Vertical Merge (up to three lines, e.g. "10" / "+0.1" / "0").
+    # The merge decisions are precomputed in bulk: one boxes array, one
+    # pairwise vertical-distance comparison, and one continuation mask per
+    # line, so the walk below only stitches groups together.
+    n_lines = len(all_lines)
+    if n_lines:
+        texts = [l["text"] for l in all_lines]
+        boxes = np.array([l["bbox"] for l in all_lines])
+
+        # Tolerance continuations (+X / -X / bare 0); modifiers like "3x"
+        # additionally qualify a SECOND line but not a third
+        mod_match = engineering_patterns.MODIFIER_PATTERN.match
+        is_tol = np.fromiter(
+            (t[0] in "+-" or t.strip() == "0" for t in texts),
+            dtype=bool, count=n_lines)
+        follows = np.fromiter(
+            (is_tol[k] or mod_match(texts[k]) is not None
+             for k in range(n_lines)),
+            dtype=bool, count=n_lines)
+
+        # Line k can merge into its predecessor when it is a continuation
+        # and starts within 15 units below it (slightly increased threshold)
+        can_merge = np.empty(n_lines, dtype=bool)
+        can_merge[0] = False
+        can_merge[1:] = (boxes[1:, 1] - boxes[:-1, 3] < 15) & follows[1:]
 
-    for line_data in processed_lines:
+        i = 0
+        while i < n_lines:
+            end = i + 1
+            if end < n_lines and can_merge[end]:
+                end += 1
+                # Third line: distance is measured against the merged bbox
+                if (end < n_lines and is_tol[end] and
+                        boxes[end, 1] - boxes[i:end, 3].max() < 15):
+                    end += 1
+
+            if end - i == 1:
+                processed_lines.append(all_lines[i])
+            else:
+                # Running min/max accumulator over the 2-3 merged lines:
+                # cheaper than array reductions at this group size
+                x0, y0, x1, y1 = all_lines[i]["bbox"]
+                for k in range(i + 1, end):
+                    bx0, by0, bx1, by1 = all_lines[k]["bbox"]
+                    if bx0 < x0:
+                        x0 = bx0
+                    if by0 < y0:
+                        y0 = by0
+                    if bx1 > x1:
+                        x1 = bx1
+                    if by1 > y1:
+                        y1 = by1
+                processed_lines.append({
+                    "text": " ".join(texts[i:end]),
+                    "bbox": (x0, y0, x1, y1),
+                })
+            i = end
+
+    # Multi-pattern prefilter for the whole page at once: one finditer
+    # over the concatenated lines marks which lines any feature pattern
+    # can match at all. Lines with no hit (the majority) skip every
+    # branch below; hit lines run the original per-pattern priority
+    # chain, because the combined alternation cannot reproduce it — an
+    # alternative's match can start inside the span a higher-priority
+    # pattern would have claimed, hiding it from finditer.
+    line_hits = engineering_patterns.scan_page(
+        [l["text"] for l in processed_lines])
+
+    for line_idx, line_data in enumerate(processed_lines):
         line_text = line_data["text"]
         line_bbox = line_data["bbox"]
-        
+        has_pattern_hit = bool(line_hits[line_idx])
+
         # --- PRIORITY 0: Metadata ---
+        # One search of the fused alternation rules out the common case of
+        # a line with no metadata key at all. On a hit, the per-type
+        # patterns run in dict order: the alternation cannot decide the
+        # winner itself, because it picks the leftmost key on multi-key
+        # lines (e.g. 'DATE 2024 REV B' must stay REVISION, not DATE) and
+        # a type whose captured value is empty must fall through to the
+        # next one.
         is_metadata = False
-        for meta_type, pattern in engineering_patterns.METADATA_PATTERNS.items():
-            meta_match = pattern.search(line_text)
-            if meta_match:
-                val = meta_match.group(2).strip()
-                if val: # Only if there is a value
-                    f = Feature(
-                        id=None, # No ID for Metadata
-                        type="Metadata",
-                        value=val,
-                        location=line_bbox,
-                        page_num=page_num,
-                        sub_type=meta_type,
-                        description=f"{meta_type}: {val}"
-                    )
-                    features.append(f)
-                    # Do NOT increment feature_id
-                    is_metadata = True
-                    break
+        if engineering_patterns.METADATA_COMBINED.search(line_text):
+            for meta_type, pattern in engineering_patterns.METADATA_PATTERNS.items():
+                meta_match = pattern.search(line_text)
+                if meta_match:
+                    val = meta_match.group(2).strip()
+                    if val: # Only if there is a value
+                        f = Feature(
+                            id=None, # No ID for Metadata
+                            type="Metadata",
+                            value=val,
+                            location=line_bbox,
+                            page_num=page_num,
+                            sub_type=meta_type,
+                            description=f"{meta_type}: {val}"
+                        )
+                        features.append(f)
+                        # Do NOT increment feature_id
+                        is_metadata = True
+                        break
         if is_metadata:
             continue
 
         # --- PRIORITY 0.5: Table Headers / Text ---
         # Check if line contains table headers
-        if any(header in line_text.upper() for header in engineering_patterns.TABLE_HEADERS):
+        if engineering_patterns.has_table_header(line_text):
             f = Feature(
                 id=None, # No ID for Notes/Headers
                 type="Note",
@@ -252,14 +296,17 @@ def extract_features(pdf_page, image, page_num):
             continue
 
         # --- PRIORITY 1: GD&T (Text-based) ---
-        # Check for GD&T symbols in text
-        gdt_match = engineering_patterns.GDT_TEXT_PATTERN.search(line_text)
+        # Check for GD&T symbols in text. A codepoint-set intersection
+        # gates the regex since most lines contain no GD&T symbol at all.
+        gdt_match = None
+        if engineering_patterns.GDT_CODEPOINTS & set(map(ord, line_text)):
+            gdt_match = engineering_patterns.GDT_TEXT_PATTERN.search(line_text)
         if gdt_match:
             symbol = gdt_match.group(1)
             value = gdt_match.group(2)
             datum = gdt_match.group(4).strip()
-            
-            symbol_name = engineering_patterns.GDT_SYMBOLS.get(symbol, "Unknown Symbol")
+
+            symbol_name = engineering_patterns.GDT_BY_CP.get(ord(symbol), "Unknown Symbol")
             
             # Fix: Diameter symbol (⌀) is often caught here but should be treated as a Dimension
             if symbol_name == "Diameter":
@@ -280,7 +327,8 @@ def extract_features(pdf_page, image, page_num):
                 continue # Skip other checks
         
         # --- PRIORITY 2: Threads ---
-        thread_match = engineering_patterns.THREAD_PATTERN.search(line_text)
+        thread_match = (engineering_patterns.THREAD_PATTERN.search(line_text)
+                        if has_pattern_hit else None)
         if thread_match:
             f = Feature(
                 id=feature_id,
@@ -296,7 +344,8 @@ def extract_features(pdf_page, image, page_num):
             continue
         
         # --- PRIORITY 3: Chamfers ---
-        chamfer_match = engineering_patterns.CHAMFER_PATTERN.search(line_text)
+        chamfer_match = (engineering_patterns.CHAMFER_PATTERN.search(line_text)
+                         if has_pattern_hit else None)
         if chamfer_match:
             f = Feature(
                 id=feature_id,
@@ -312,7 +361,8 @@ def extract_features(pdf_page, image, page_num):
             continue
 
         # --- PRIORITY 3.1: Surface Finish ---
-        sf_match = engineering_patterns.SURFACE_FINISH_PATTERN.search(line_text)
+        sf_match = (engineering_patterns.SURFACE_FINISH_PATTERN.search(line_text)
+                    if has_pattern_hit else None)
         if sf_match:
             f = Feature(
                 id=feature_id,
@@ -328,7 +378,8 @@ def extract_features(pdf_page, image, page_num):
             continue
 
         # --- PRIORITY 3.2: Hardness/Material ---
-        hard_match = engineering_patterns.HARDNESS_PATTERN.search(line_text)
+        hard_match = (engineering_patterns.HARDNESS_PATTERN.search(line_text)
+                      if has_pattern_hit else None)
         if hard_match:
             f = Feature(
                 id=feature_id,
@@ -344,7 +395,8 @@ def extract_features(pdf_page, image, page_num):
             continue
 
         # --- PRIORITY 3.3: Welding ---
-        weld_match = engineering_patterns.WELDING_PATTERN.search(line_text)
+        weld_match = (engineering_patterns.WELDING_PATTERN.search(line_text)
+                      if has_pattern_hit else None)
         if weld_match:
             f = Feature(
                 id=feature_id,
@@ -361,7 +413,8 @@ def extract_features(pdf_page, image, page_num):
         
         # --- PRIORITY 4: Dimensions (Linear & Holes) ---
         # Uses improved regex from engineering_patterns to capture tolerances like +0.2 / +0.1
-        match = engineering_patterns.DIMENSION_PATTERN.search(line_text)
+        match = (engineering_patterns.DIMENSION_PATTERN.search(line_text)
+                 if has_pattern_hit else None)
         if match:
             val = match.group(0)
             
@@ -370,14 +423,15 @@ def extract_features(pdf_page, image, page_num):
             # Note: Threads (M5) are already caught by Priority 2.
             # EXCEPTION: "R" prefix is Radius (e.g., R5), so keep it.
             if engineering_patterns.ALPHANUMERIC_LABEL_PATTERN.match(val):
-                if not val.upper().startswith("R"):
+                if val[0] not in "Rr":
                     continue
 
             if len(val) < 30: # Filter noise
-                # Determine Type
-                if "Ø" in val or "R" in val or "\u2300" in val:
+                # Determine Type (single pass over the value's characters)
+                val_chars = set(val)
+                if _HOLE_RADIUS_CHARS & val_chars:
                     feat_type = "Hole/Radius"
-                    sub_type = "Diameter" if ("Ø" in val or "\u2300" in val) else "Radius"
+                    sub_type = "Diameter" if _DIAMETER_CHARS & val_chars else "Radius"
                     # Assign ID for Holes
                     f_id = feature_id
                     feature_id += 1
@@ -389,15 +443,16 @@ def extract_features(pdf_page, image, page_num):
                     f_id = feature_id
                     feature_id += 1
                     
-                # Check for Hole Modifiers
-                desc = []
-                for mod in engineering_patterns.HOLE_MODIFIERS:
-                    if mod in line_text:
-                        desc.append(mod)
+                # Check for Hole Modifiers: one pass over the line,
+                # deduplicated in order of appearance
+                desc = list(dict.fromkeys(
+                    engineering_patterns.HOLE_MODIFIERS_RE.findall(line_text)))
                 
                 # Capture any other remaining text (like "4X", "@'a'", etc.)
-                # Remove the extracted value from the full line text
-                remainder = line_text.replace(val, "").strip()
+                # Remove the matched value by span: no rescan of the line,
+                # and a repeated substring elsewhere in it is left alone
+                s, e = match.span()
+                remainder = (line_text[:s] + line_text[e:]).strip()
                 if remainder:
                     # Avoid duplicating modifiers if they were already found
                     if remainder not in desc:
@@ -415,37 +470,61 @@ def extract_features(pdf_page, image, page_num):
                     location=line_bbox, # Use line bbox to encompass full dimension
                     page_num=page_num,
                     sub_type=sub_type,
-                    description=description
+                    description=description,
+                    min_val=min_val,
+                    max_val=max_val
                 )
-                
-                # Set tolerance values
-                f.min_val = min_val
-                f.max_val = max_val
-                
                 features.append(f)
 
     # 2. GD&T Frame Detection (OpenCV)
-    # Convert to grayscale
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    # Convert to grayscale (pages are rendered grayscale by default now,
+    # so this is usually a no-op)
+    if image.ndim == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = image
     # Threshold
     _, thresh = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
-    # Find contours
-    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    for cnt in contours:
-        x, y, w, h = cv2.boundingRect(cnt)
-        # Filter for rectangular frames typical of GD&T
-        # Aspect ratio > 1, reasonable size
-        if w > 20 and h > 10 and w < 500 and h < 100:
-            # Check if it's a rectangle (approximate)
+    # Morphological line-grid pre-filter: opening with horizontal and
+    # vertical kernels keeps only straight frame strokes, erasing text and
+    # blob noise before any per-component work. Kernel lengths sit just
+    # below the minimum frame size accepted by the filter further down, so
+    # no qualifying frame is lost.
+    horiz = cv2.morphologyEx(
+        thresh, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (20, 1)))
+    vert = cv2.morphologyEx(
+        thresh, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_RECT, (1, 10)))
+    # Dilate so the horizontal and vertical strokes of one frame reconnect
+    # into a single component
+    rect_mask = cv2.dilate(cv2.bitwise_or(horiz, vert), np.ones((3, 3), dtype=np.uint8))
+
+    # One C call returns every blob's bounding box, so the size filter for
+    # frame-like candidates runs as a vector op instead of a Python loop
+    # over boundingRect for every contour on the page
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(rect_mask, connectivity=8)
+    widths = stats[:, cv2.CC_STAT_WIDTH]
+    heights = stats[:, cv2.CC_STAT_HEIGHT]
+    candidates = np.flatnonzero(
+        (widths > 20) & (heights > 10) & (widths < 500) & (heights < 100))
+    candidates = candidates[candidates != 0]  # Label 0 is the background
+
+    if len(candidates):
+        scale_x = pdf_page.rect.width / image.shape[1]
+        scale_y = pdf_page.rect.height / image.shape[0]
+
+        for idx in candidates:
+            x, y, w, h = stats[idx, :4]
+            # Rectangle check (approxPolyDP) now runs only on the few
+            # survivors, against the blob's own ROI
+            roi = (labels[y:y + h, x:x + w] == idx).astype(np.uint8)
+            contours, _ = cv2.findContours(roi, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            if not contours:
+                continue
+            cnt = max(contours, key=cv2.contourArea)
             approx = cv2.approxPolyDP(cnt, 0.02 * cv2.arcLength(cnt, True), True)
             if len(approx) == 4:
-                
-                scale_x = pdf_page.rect.width / image.shape[1]
-                scale_y = pdf_page.rect.height / image.shape[0]
-                
                 pdf_bbox = (x * scale_x, y * scale_y, (x + w) * scale_x, (y + h) * scale_y)
-                
+
                 f = Feature(
                     id=feature_id,
                     type="GD&T",
@@ -458,7 +537,8 @@ def extract_features(pdf_page, image, page_num):
 
     # 3. Spatial Filtering (Title Block & Tables)
     # Pass the PDF page object to access vector drawings
-    features = filter_spatial_noise(features, pdf_page)
+    features = filter_spatial_noise(
+        features, pdf_page, cache.drawings if cache is not None else None)
     
     # 4. Zone Filtering (Border Noise)
     features = filter_zone_noise(features, pdf_page)
@@ -474,36 +554,143 @@ def filter_zone_noise(features, pdf_page):
     
     # Define Margins (e.g. 30 units from edge)
     margin = 30
-    
-    for f in features:
-        if f.id is None:
-            continue
-            
-        x0, y0, x1, y1 = f.location
-        
-        # Check if inside margins
-        in_left_margin = x1 < margin
-        in_right_margin = x0 > (page_w - margin)
-        in_top_margin = y1 < margin
-        in_bottom_margin = y0 > (page_h - margin)
-        
-        if in_left_margin or in_right_margin or in_top_margin or in_bottom_margin:
-            # Only filter if it looks like a zone index (short text)
-            if len(f.value) <= 2:
-                f.id = None
-                f.type = "Note"
-                f.sub_type = "Zone Index"
-                
+
+    candidates = [f for f in features if f.id is not None]
+    if not candidates:
+        return features
+
+    # One vectorized margin test over all bounding boxes instead of four
+    # scalar comparisons per feature in Python
+    loc = np.array([f.location for f in candidates])
+    in_margin = ((loc[:, 2] < margin) |                  # Left
+                 (loc[:, 0] > (page_w - margin)) |       # Right
+                 (loc[:, 3] < margin) |                  # Top
+                 (loc[:, 1] > (page_h - margin)))        # Bottom
+
+    for i in np.flatnonzero(in_margin):
+        f = candidates[i]
+        # Only filter if it looks like a zone index (short text)
+        if len(f.value) <= 2:
+            f.id = None
+            f.type = "Note"
+            f.sub_type = "Zone Index"
+
     return features
 
-def filter_spatial_noise(features, pdf_page):
+class _DisjointSet:
+    """Array-based union-find with path compression and union by rank."""
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+
+    def find(self, i):
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:  # Path compression
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj:
+            return
+        if self.rank[ri] < self.rank[rj]:
+            ri, rj = rj, ri
+        self.parent[rj] = ri
+        if self.rank[ri] == self.rank[rj]:
+            self.rank[ri] += 1
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def _uf_find(parent, i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]  # Path halving
+            i = parent[i]
+        return i
+
+    @njit(cache=True)
+    def _cluster_rects(bounds, pitch):
+        """
+        Compiled twin of the Python clustering path: buckets rects into a
+        grid of the given pitch, runs the expanded-by-1 overlap test on
+        pairs sharing a cell, and merges with union-find. Takes an (N, 4)
+        array of [x0, y0, x1, y1] bounds; returns the root index per rect.
+        """
+        n = bounds.shape[0]
+        parent = np.arange(n, dtype=np.int32)
+        rank = np.zeros(n, dtype=np.int32)
+
+        # Count covered cells, then fill flat (cell_id, owner) pairs
+        total = 0
+        for i in range(n):
+            gx0 = np.int64(np.floor((bounds[i, 0] - 1.0) / pitch))
+            gx1 = np.int64(np.floor((bounds[i, 2] + 1.0) / pitch))
+            gy0 = np.int64(np.floor((bounds[i, 1] - 1.0) / pitch))
+            gy1 = np.int64(np.floor((bounds[i, 3] + 1.0) / pitch))
+            total += (gx1 - gx0 + 1) * (gy1 - gy0 + 1)
+
+        cell_ids = np.empty(total, dtype=np.int64)
+        owners = np.empty(total, dtype=np.int32)
+        k = 0
+        for i in range(n):
+            gx0 = np.int64(np.floor((bounds[i, 0] - 1.0) / pitch))
+            gx1 = np.int64(np.floor((bounds[i, 2] + 1.0) / pitch))
+            gy0 = np.int64(np.floor((bounds[i, 1] - 1.0) / pitch))
+            gy1 = np.int64(np.floor((bounds[i, 3] + 1.0) / pitch))
+            for gx in range(gx0, gx1 + 1):
+                for gy in range(gy0, gy1 + 1):
+                    cell_ids[k] = (gx << 32) ^ (gy & 0xFFFFFFFF)
+                    owners[k] = i
+                    k += 1
+
+        # Sorting groups entries of the same cell into one run
+        order = np.argsort(cell_ids)
+        start = 0
+        while start < total:
+            end = start + 1
+            while end < total and cell_ids[order[end]] == cell_ids[order[start]]:
+                end += 1
+            for a in range(start, end - 1):
+                i = owners[order[a]]
+                x0 = bounds[i, 0] - 1.0
+                y0 = bounds[i, 1] - 1.0
+                x1 = bounds[i, 2] + 1.0
+                y1 = bounds[i, 3] + 1.0
+                for b in range(a + 1, end):
+                    j = owners[order[b]]
+                    ri = _uf_find(parent, i)
+                    rj = _uf_find(parent, j)
+                    if ri == rj:
+                        continue
+                    if (bounds[j, 0] > x1 or bounds[j, 2] < x0 or
+                            bounds[j, 1] > y1 or bounds[j, 3] < y0):
+                        continue
+                    if rank[ri] < rank[rj]:
+                        ri, rj = rj, ri
+                    parent[rj] = ri
+                    if rank[ri] == rank[rj]:
+                        rank[ri] += 1
+            start = end
+
+        for i in range(n):
+            parent[i] = _uf_find(parent, i)
+        return parent
+
+
+def filter_spatial_noise(features, pdf_page, drawings=None):
     """
     Identifies Title Block and Table regions using VECTOR GRAPHICS (Rectangles)
     and removes IDs from features inside them.
     Uses CLUSTERING to distinguish tables (grids) from isolated geometry.
+    Accepts pre-parsed drawings (from a PageCache) to skip re-traversal.
     """
     # 1. Extract Vector Rectangles
-    drawings = pdf_page.get_drawings()
+    if drawings is None:
+        drawings = pdf_page.get_drawings()
     rects = []
     
     for path in drawings:
@@ -517,58 +704,81 @@ def filter_spatial_noise(features, pdf_page):
             rects.append(r)
             
     # 2. Cluster Rectangles (Find Grids)
-    # Two rects are connected if they touch or overlap (share an edge)
-    # We'll use a simple adjacency list
-    adj = {i: [] for i in range(len(rects))}
-    
-    for i in range(len(rects)):
-        for j in range(i + 1, len(rects)):
-            r1 = rects[i]
-            r2 = rects[j]
-            
-            # Check for intersection or touching
-            # Expand r1 slightly to catch touching edges
-            r1_expanded = (r1.x0 - 1, r1.y0 - 1, r1.x1 + 1, r1.y1 + 1)
-            
-            # Check overlap
-            if not (r2.x0 > r1_expanded[2] or r2.x1 < r1_expanded[0] or
-                    r2.y0 > r1_expanded[3] or r2.y1 < r1_expanded[1]):
-                adj[i].append(j)
-                adj[j].append(i)
-                
-    # Find Connected Components
-    visited = set()
+    # Two rects are connected if they touch or overlap (share an edge).
+    # Rects are bucketed into a coarse spatial grid so only pairs sharing a
+    # bucket get the overlap test (~N*k instead of N^2 pair tests on
+    # table-heavy pages), then merged into components with union-find.
+    n = len(rects)
+
+    if n:
+        # Grid pitch ~ median rect dimension, floored so small cells don't
+        # explode the bucket count
+        dims = sorted(d for r in rects for d in (r.width, r.height))
+        pitch = max(10.0, dims[len(dims) // 2])
+
+    if n and HAVE_NUMBA:
+        # Compiled path: same bucketing and overlap test, machine code
+        bounds = np.array([(r.x0, r.y0, r.x1, r.y1) for r in rects])
+        roots = _cluster_rects(bounds, pitch)
+        components = {}
+        for i in range(n):
+            components.setdefault(int(roots[i]), []).append(rects[i])
+    else:
+        dsu = _DisjointSet(n)
+        if n:
+            buckets = {}
+            for i, r in enumerate(rects):
+                # Expand by 1 so touching edges land in a shared bucket
+                gx0 = int((r.x0 - 1) // pitch)
+                gx1 = int((r.x1 + 1) // pitch)
+                gy0 = int((r.y0 - 1) // pitch)
+                gy1 = int((r.y1 + 1) // pitch)
+                for gx in range(gx0, gx1 + 1):
+                    for gy in range(gy0, gy1 + 1):
+                        buckets.setdefault((gx, gy), []).append(i)
+
+            for members in buckets.values():
+                for a in range(len(members) - 1):
+                    i = members[a]
+                    r1 = rects[i]
+                    # Expand r1 slightly to catch touching edges
+                    x0, y0, x1, y1 = r1.x0 - 1, r1.y0 - 1, r1.x1 + 1, r1.y1 + 1
+                    for b in range(a + 1, len(members)):
+                        j = members[b]
+                        if dsu.find(i) == dsu.find(j):
+                            continue  # Already in the same component
+                        r2 = rects[j]
+                        # Same expanded-rect overlap test as the old pair loop
+                        if not (r2.x0 > x1 or r2.x1 < x0 or
+                                r2.y0 > y1 or r2.y1 < y0):
+                            dsu.union(i, j)
+
+        # Group rects into components by root; iterating in index order
+        # keeps the lowest-index rect first, as the old DFS did
+        components = {}
+        for i in range(n):
+            components.setdefault(dsu.find(i), []).append(rects[i])
+
     table_rects = []
-    
+
     page_h = pdf_page.rect.height
     bottom_threshold = page_h * 0.70 # Bottom 30%
-    
-    for i in range(len(rects)):
-        if i not in visited:
-            component = []
-            stack = [i]
-            visited.add(i)
-            while stack:
-                curr = stack.pop()
-                component.append(rects[curr])
-                for neighbor in adj[curr]:
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        stack.append(neighbor)
-            
-            # Heuristic: 
-            # 1. Standard Table: Grid of cells (>= 3 connected).
-            # 2. Split Title Block: Even single/double rectangles in the bottom-right are likely title blocks.
-            
-            # Check location of component (use center of first rect)
-            comp_y = component[0].y0
-            
-            min_cluster_size = 3
-            if comp_y > bottom_threshold:
-                min_cluster_size = 1 # Relax for title block area
-                
-            if len(component) >= min_cluster_size:
-                table_rects.extend(component)
+
+    for component in components.values():
+        # Heuristic:
+        # 1. Standard Table: Grid of cells (>= 3 connected).
+        # 2. Split Title Block: Even single/double rectangles in the
+        #    bottom-right are likely title blocks.
+
+        # Check location of component (use center of first rect)
+        comp_y = component[0].y0
+
+        min_cluster_size = 3
+        if comp_y > bottom_threshold:
+            min_cluster_size = 1 # Relax for title block area
+
+        if len(component) >= min_cluster_size:
+            table_rects.extend(component)
 
     # 3. Identify Title Block Zone (Fallback)
     # Only consider metadata in the bottom 30% of the page
@@ -603,41 +813,50 @@ def filter_spatial_noise(features, pdf_page):
         explicit_table_zones.append(zone)
 
     # 5. Filter Features
-    for f in features:
-        if f.id is None:
-            continue
-            
-        cx = (f.location[0] + f.location[2]) / 2
-        cy = (f.location[1] + f.location[3]) / 2
-        
-        # Check Vector Table Rects
-        in_table = False
-        for r in table_rects:
-            if cx >= r.x0 and cx <= r.x1 and cy >= r.y0 and cy <= r.y1: # Corrected: cy >= r.y0 and cy <= r.y1
-                in_table = True
-                break
-        
-        if in_table:
+    # Point-in-rect tests run as one broadcast per zone set (feature centers
+    # against all rects at once) instead of nested Python loops of scalar
+    # comparisons.
+    candidates = [f for f in features if f.id is not None]
+    if not candidates:
+        return features
+
+    centers = np.array([((f.location[0] + f.location[2]) * 0.5,
+                         (f.location[1] + f.location[3]) * 0.5)
+                        for f in candidates])
+    cx = centers[:, 0:1]
+    cy = centers[:, 1:2]
+
+    def _inside(zone_array):
+        return ((cx >= zone_array[:, 0]) & (cx <= zone_array[:, 2]) &
+                (cy >= zone_array[:, 1]) & (cy <= zone_array[:, 3])).any(axis=1)
+
+    n_cand = len(candidates)
+    in_table = np.zeros(n_cand, dtype=bool)
+    if table_rects:
+        in_table = _inside(np.array([(r.x0, r.y0, r.x1, r.y1) for r in table_rects]))
+
+    in_title_block = np.zeros(n_cand, dtype=bool)
+    if title_block_zone:
+        in_title_block = _inside(np.array([title_block_zone]))
+
+    in_explicit = np.zeros(n_cand, dtype=bool)
+    if explicit_table_zones:
+        in_explicit = _inside(np.array(explicit_table_zones))
+
+    for i, f in enumerate(candidates):
+        # Same precedence as before: vector table rects, then title block,
+        # then explicit table zones
+        if in_table[i]:
             f.id = None
             f.type = "Note"
             f.sub_type = "Table/Content"
-            continue
-            
-        # Check Title Block Zone (Backup)
-        if title_block_zone:
-            if (cx >= title_block_zone[0] and cx <= title_block_zone[2] and 
-                cy >= title_block_zone[1] and cy <= title_block_zone[3]):
-                f.id = None
-                f.type = "Note"
-                f.sub_type = "TitleBlock/Context"
-                continue
-                
-        # Check Explicit Table Zones
-        for zone in explicit_table_zones:
-             if (cx >= zone[0] and cx <= zone[2] and cy >= zone[1] and cy <= zone[3]):
-                f.id = None
-                f.type = "Note"
-                f.sub_type = "Table/Content"
-                break
-                
+        elif in_title_block[i]:
+            f.id = None
+            f.type = "Note"
+            f.sub_type = "TitleBlock/Context"
+        elif in_explicit[i]:
+            f.id = None
+            f.type = "Note"
+            f.sub_type = "Table/Content"
+
     return features
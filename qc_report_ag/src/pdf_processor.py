@@ -1,5 +1,4 @@
 import fitz  # PyMuPDF
-import cv2
 import numpy as np
 
 def load_pdf(path):
@@ -11,24 +10,59 @@ def load_pdf(path):
         print(f"Error loading PDF: {e}")
         return None
 
-def get_page_image(page):
-    """Renders a PDF page as an OpenCV image."""
-    pix = page.get_pixmap()
-    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
-    if pix.n == 4:  # RGBA
-        img = cv2.cvtColor(img, cv2.COLOR_RGBA2BGR)
-    elif pix.n == 3:  # RGB
-        img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-    return img
-
-def get_vector_data(page):
+def get_page_image(page, color=False):
+    """
+    Renders a PDF page as an OpenCV image.
+    Defaults to a single-channel grayscale array: the extractor only does
+    threshold/contour work, so skipping the RGB render cuts the pixel
+    bandwidth 3x. Pass color=True for a 3-channel BGR image.
+    """
+    # pix.samples materializes an intermediate bytes object of the whole
+    # render; pix.samples_mv views the pixmap's buffer directly. That
+    # buffer dies with the pixmap, so the view must be copied out while
+    # the pixmap is still in scope — one full-page move either way, but
+    # without the transient bytes duplicate.
+    if not color:
+        pix = page.get_pixmap(colorspace=fitz.csGRAY, alpha=False)
+        return np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
+            pix.h, pix.w).copy()
+
+    pix = page.get_pixmap(alpha=False)
+    src = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
+    # RGB -> BGR is just a channel reversal; the strided copy into the
+    # preallocated output doubles as the copy out of the pixmap buffer
+    out = np.empty((pix.h, pix.w, pix.n), dtype=np.uint8)
+    out[:] = src[:, :, ::-1]
+    return out
+
+class PageCache:
+    """
+    Parses a page's text dict and vector drawings and renders its image
+    once, so every stage that needs them (extraction, spatial filtering)
+    shares one traversal of the content stream per page.
+    """
+    __slots__ = ("text_dict", "drawings", "image")
+
+    def __init__(self, page):
+        self.text_dict = page.get_text("dict")
+        self.drawings = page.get_drawings()
+        self.image = get_page_image(page)
+
+
+def get_vector_data(page, cache=None):
     """Extracts vector drawings and text from the page."""
+    if cache is not None:
+        return {
+            "text_blocks": cache.text_dict["blocks"],
+            "drawings": cache.drawings
+        }
+
     # Extract text blocks
     text_blocks = page.get_text("dict")["blocks"]
-    
+
     # Extract drawings (lines, rectangles, etc.)
     drawings = page.get_drawings()
-    
+
     return {
         "text_blocks": text_blocks,
         "drawings": drawings
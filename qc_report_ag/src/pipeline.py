@@ -0,0 +1,134 @@
+import concurrent.futures
+import hashlib
+import os
+
+from . import pdf_processor, extractor, ballooner, excel_writer, bufferpool
+
+# Memoized Excel reports keyed on the extracted-feature fingerprint, so
+# byte-different PDFs with identical extractions still share the work
+_excel_memo = {}
+_EXCEL_MEMO_MAX = 128
+
+
+def _features_key(features):
+    """
+    Stable fingerprint of a feature list, covering every field the Excel
+    report reads.
+    """
+    fields = repr([
+        (f.id, f.type, f.sub_type, f.value, f.min_val, f.max_val,
+         f.description, f.page_num)
+        for f in features
+    ])
+    return hashlib.blake2b(fields.encode(), digest_size=16).hexdigest()
+
+
+def excel_bytes_for(features):
+    """Generates the Excel report for a feature list, memoized on content."""
+    key = _features_key(features)
+    cached = _excel_memo.get(key)
+    if cached is not None:
+        return cached
+
+    # Pooled buffer: workers that process several files reuse the same
+    # allocation instead of growing a fresh BytesIO per report
+    excel_buffer = bufferpool.acquire()
+    try:
+        excel_writer.generate_excel_report(features, excel_buffer)
+        excel_bytes = excel_buffer.getvalue()
+    finally:
+        bufferpool.release(excel_buffer)
+
+    if len(_excel_memo) < _EXCEL_MEMO_MAX:
+        _excel_memo[key] = excel_bytes
+    return excel_bytes
+
+
+def _process_page(pdf_path, page_num):
+    """
+    Renders and extracts a single page. Opens its own document handle
+    because fitz documents are not safe to share across workers.
+    """
+    doc = pdf_processor.load_pdf(pdf_path)
+    page = doc[page_num]
+    cache = pdf_processor.PageCache(page)
+    return extractor.extract_features(page, cache.image, page_num, cache=cache)
+
+
+def _append_page(all_features, features, id_offset):
+    """
+    Appends one page's features, offsetting balloon IDs by the running
+    total so numbering stays unique across pages (each worker starts its
+    page at ID 1). Returns the offset for the next page.
+    """
+    page_max = 0
+    for f in features:
+        if f.id is not None:
+            f.id += id_offset
+            if f.id > page_max:
+                page_max = f.id
+    all_features.extend(features)
+    return page_max if page_max else id_offset
+
+
+def extract_all_pages(pdf_path, page_count, max_workers=None):
+    """
+    Extracts features from every page of a PDF, fanning pages out to a
+    process pool. Rendering releases the GIL in the MuPDF layer and the
+    extractor itself is CPU-bound, so pages scale across cores. Falls back
+    to in-process extraction for single-page documents where pool startup
+    would cost more than it saves.
+    """
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, 6)
+
+    if page_count <= 1 or max_workers <= 1:
+        all_features = []
+        id_offset = 0
+        for page_num in range(page_count):
+            id_offset = _append_page(
+                all_features, _process_page(pdf_path, page_num), id_offset)
+        return all_features
+
+    all_features = []
+    id_offset = 0
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(max_workers, page_count)
+    ) as executor:
+        # executor.map preserves page order
+        for features in executor.map(
+            _process_page, [pdf_path] * page_count, range(page_count)
+        ):
+            id_offset = _append_page(all_features, features, id_offset)
+    return all_features
+
+
+def process_one(pdf_path, name):
+    """
+    Runs the full pipeline (load -> extract -> balloon -> excel) for one PDF.
+    Lives outside app.py so worker processes can import it without
+    re-executing the Streamlit script. Takes a plain file path and returns
+    only picklable data (bytes, not fitz handles or BytesIO buffers).
+    Returns None if the PDF could not be loaded.
+    """
+    doc = pdf_processor.load_pdf(pdf_path)
+    if not doc:
+        return None
+
+    # Already running inside a worker process here, so keep page
+    # extraction in-process rather than nesting pools.
+    all_features = extract_all_pages(pdf_path, len(doc), max_workers=1)
+
+    base_name = name.replace('.pdf', '')
+
+    excel_bytes = excel_bytes_for(all_features)
+
+    pdf_bytes = ballooner.add_balloons(pdf_path, all_features)
+
+    return {
+        'features': all_features,
+        'excel_bytes': excel_bytes,
+        'pdf_bytes': pdf_bytes,
+        'page_count': len(doc),
+        'base_name': base_name,
+    }
@@ -0,0 +1,202 @@
+"""
+Optional libxlsxwriter (C) backend for the inspection report.
+
+The C reimplementation of xlsxwriter removes Python per-cell overhead from
+the write path almost entirely. It is strictly opt-in: the Python backend
+stays the default, and this one is used only when QC_REPORT_XLSX_BACKEND=c
+is set, the shared library is on the loader path, and the report targets a
+file path.
+
+Only the stable function-call C API is bound (typed cell writers, formats,
+column widths, merged ranges). Conditional formatting goes through a
+version-dependent C struct, so this backend skips the Pass/Fail colour
+rules; the formulas still evaluate to PASS/FAIL text.
+"""
+
+import ctypes
+import ctypes.util
+
+from xlsxwriter.utility import xl_col_to_name as _col_name
+
+# lxw constants (enum values are part of the documented API)
+_BORDER_THIN = 1
+_ALIGN_LEFT = 1
+_ALIGN_CENTER = 2
+
+# (restype, argtypes) for every call the report needs; loading fails closed
+# if any symbol is missing.
+_c_char_p = ctypes.c_char_p
+_c_void_p = ctypes.c_void_p
+_c_double = ctypes.c_double
+_c_int = ctypes.c_int
+_c_row = ctypes.c_uint32   # lxw_row_t
+_c_col = ctypes.c_uint16   # lxw_col_t
+_PROTOTYPES = {
+    "workbook_new": (_c_void_p, [_c_char_p]),
+    "workbook_add_worksheet": (_c_void_p, [_c_void_p, _c_char_p]),
+    "workbook_add_format": (_c_void_p, [_c_void_p]),
+    "workbook_close": (_c_int, [_c_void_p]),
+    "format_set_bold": (None, [_c_void_p]),
+    "format_set_font_size": (None, [_c_void_p, _c_double]),
+    "format_set_bg_color": (None, [_c_void_p, ctypes.c_uint32]),
+    "format_set_font_color": (None, [_c_void_p, ctypes.c_uint32]),
+    "format_set_border": (None, [_c_void_p, ctypes.c_uint8]),
+    "format_set_align": (None, [_c_void_p, ctypes.c_uint8]),
+    "worksheet_write_string": (_c_int, [_c_void_p, _c_row, _c_col, _c_char_p, _c_void_p]),
+    "worksheet_write_number": (_c_int, [_c_void_p, _c_row, _c_col, _c_double, _c_void_p]),
+    "worksheet_write_blank": (_c_int, [_c_void_p, _c_row, _c_col, _c_void_p]),
+    "worksheet_write_formula": (_c_int, [_c_void_p, _c_row, _c_col, _c_char_p, _c_void_p]),
+    "worksheet_set_column": (_c_int, [_c_void_p, _c_col, _c_col, _c_double, _c_void_p]),
+    "worksheet_merge_range": (_c_int, [_c_void_p, _c_row, _c_col, _c_row, _c_col, _c_char_p, _c_void_p]),
+}
+
+
+def _load():
+    name = ctypes.util.find_library("xlsxwriter")
+    if not name:
+        return None
+    try:
+        lib = ctypes.CDLL(name)
+    except OSError:
+        return None
+    for fname, (restype, argtypes) in _PROTOTYPES.items():
+        fn = getattr(lib, fname, None)
+        if fn is None:
+            return None
+        fn.restype = restype
+        fn.argtypes = argtypes
+    return lib
+
+
+_LIB = _load()
+HAVE_LIBXLSXWRITER = _LIB is not None
+
+
+def write_report(metadata, tables, output_path, table_configs):
+    """
+    Writes the inspection report through libxlsxwriter.
+
+    Args:
+        metadata: dict of part metadata key/value strings
+        tables: list of (category_name, rows) in report order, where rows
+                carry the same fields as the Python backend's row records
+        output_path: destination file path (str)
+        table_configs: the caller's per-category column layouts, so both
+                backends share one definition
+    """
+    lib = _LIB
+    wb = lib.workbook_new(str(output_path).encode("utf-8"))
+    if not wb:
+        raise OSError(f"libxlsxwriter could not create {output_path}")
+    ws = lib.workbook_add_worksheet(wb, b"Inspection Report")
+
+    def make_format(bold=False, font_size=None, bg_color=None,
+                    font_color=None, border=False, align=None):
+        fmt = lib.workbook_add_format(wb)
+        if bold:
+            lib.format_set_bold(fmt)
+        if font_size is not None:
+            lib.format_set_font_size(fmt, float(font_size))
+        if bg_color is not None:
+            lib.format_set_bg_color(fmt, bg_color)
+        if font_color is not None:
+            lib.format_set_font_color(fmt, font_color)
+        if border:
+            lib.format_set_border(fmt, _BORDER_THIN)
+        if align is not None:
+            lib.format_set_align(fmt, align)
+        return fmt
+
+    title_format = make_format(bold=True, font_size=14, bg_color=0xD9E1F2, border=True)
+    header_format = make_format(bold=True, font_size=11, bg_color=0x4472C4,
+                                font_color=0xFFFFFF, border=True, align=_ALIGN_CENTER)
+    cell_format = make_format(border=True, align=_ALIGN_CENTER)
+    text_format = make_format(border=True, align=_ALIGN_LEFT)
+
+    def write_value(r, c, val, fmt):
+        if isinstance(val, (int, float)):
+            lib.worksheet_write_number(ws, r, c, float(val), fmt)
+        elif val:
+            lib.worksheet_write_string(ws, r, c, str(val).encode("utf-8"), fmt)
+        else:
+            lib.worksheet_write_blank(ws, r, c, fmt)
+
+    # Metadata section
+    lib.worksheet_write_string(ws, 0, 0, b"PART METADATA", title_format)
+    row_idx = 1
+    for key, val in metadata.items():
+        write_value(row_idx, 0, key, header_format)
+        write_value(row_idx, 1, val, text_format)
+        row_idx += 1
+    row_idx += 2  # Spacer
+
+    # Column widths: widest request per index, set once
+    max_widths = {}
+    for config in table_configs.values():
+        for i, width in enumerate(config["widths"]):
+            if width > max_widths.get(i, 0):
+                max_widths[i] = width
+    for i, width in max_widths.items():
+        lib.worksheet_set_column(ws, i, i, float(width), None)
+
+    for cat_name, rows in tables:
+        config = table_configs[cat_name]
+        columns = config["columns"]
+
+        lib.worksheet_merge_range(ws, row_idx, 0, row_idx, len(columns) - 1,
+                                  cat_name.upper().encode("utf-8"), title_format)
+        row_idx += 1
+
+        for col_idx, col_name in enumerate(columns):
+            lib.worksheet_write_string(ws, row_idx, col_idx,
+                                       col_name.encode("utf-8"), header_format)
+        row_idx += 1
+
+        formula_template = None
+        if config["has_formula"] and "Pass/Fail" in columns:
+            # Correct past column Z, unlike chr(65 + idx)
+            min_col = _col_name(columns.index("Min"))
+            max_col = _col_name(columns.index("Max"))
+            actual_col = _col_name(columns.index("Actual"))
+            formula_template = (
+                '=IF(ISBLANK({a}{{r}}), "", '
+                'IF(AND({a}{{r}}>={mn}{{r}}, {a}{{r}}<={mx}{{r}}), '
+                '"PASS", "FAIL"))').format(a=actual_col, mn=min_col, mx=max_col)
+
+        for row_data in rows:
+            xl_row = row_idx + 1
+            for col_idx, col_name in enumerate(columns):
+                if col_name == "Balloon #":
+                    write_value(row_idx, col_idx, row_data.id, cell_format)
+                elif col_name == "Type":
+                    write_value(row_idx, col_idx, row_data.type, text_format)
+                elif col_name in ("Nominal", "Specification"):
+                    write_value(row_idx, col_idx, row_data.nominal, cell_format)
+                elif col_name == "Tolerance":
+                    tol_str = (f"{row_data.min_val} / {row_data.max_val}"
+                               if row_data.min_val is not None else "")
+                    write_value(row_idx, col_idx, tol_str, cell_format)
+                elif col_name == "Min":
+                    write_value(row_idx, col_idx, row_data.min_val, cell_format)
+                elif col_name == "Max":
+                    write_value(row_idx, col_idx, row_data.max_val, cell_format)
+                elif col_name == "Actual":
+                    lib.worksheet_write_blank(ws, row_idx, col_idx, cell_format)
+                elif col_name == "Notes":
+                    lib.worksheet_write_blank(ws, row_idx, col_idx, text_format)
+                elif col_name == "Pass/Fail":
+                    if (formula_template and row_data.min_val is not None
+                            and row_data.max_val is not None):
+                        lib.worksheet_write_formula(
+                            ws, row_idx, col_idx,
+                            formula_template.format(r=xl_row).encode("utf-8"),
+                            cell_format)
+                    else:
+                        lib.worksheet_write_blank(ws, row_idx, col_idx, cell_format)
+            row_idx += 1
+
+        row_idx += 2  # Spacer between tables
+
+    err = lib.workbook_close(wb)
+    if err:
+        raise OSError(f"libxlsxwriter failed to write {output_path} (error {err})")